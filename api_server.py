@@ -0,0 +1,330 @@
+"""Async JSON API for the news summary pipeline.
+
+Runs in-process with the same clients and caches as the dashboard would
+(everything lives in ``langchain_config``), on a plain asyncio server:
+
+    GET  /healthz
+    GET  /metrics                        Prometheus text
+    POST /v1/summary    {"query", "mode"?, "fuzzy"?, "timeout"?}
+    POST /v1/summaries  {"queries": [...], "mode"?, "concurrency"?, "timeout"?}
+    GET  /v1/stream?query=...            server-sent events: articles, bullet..., done
+
+At most ``max_concurrency`` requests run at once; up to ``max_pending`` more
+wait for a slot, and anything beyond that gets ``503`` with ``Retry-After``.
+Identical concurrent streams share one LLM stream; each connection reads it
+through a small bounded queue, so a slow reader only holds back itself. A stream
+that fails before its first event gets a plain error status (429 on quota, 503
+while the LLM circuit is open); later failures arrive as an ``error`` event.
+
+Usage: python api_server.py --port 8080 [--max-concurrency 32 --max-pending 128]
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import langchain_config
+import metrics
+from scheduler import QuotaExceededError
+from transport import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable",
+            504: "Gateway Timeout"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _result_json(result):
+    return {
+        "query": result.get("query"),
+        "summary": result["summary"],
+        "articles": [a.to_dict() for a in result["articles"]],
+        **{k: result[k] for k in ("stale", "age_seconds", "matched_query", "error") if k in result},
+    }
+
+
+def _option(body, name, valid, description, default=None):
+    value = body.get(name)
+    if value is None:
+        return default
+    if not valid(value):
+        raise HttpError(400, f"'{name}' must be {description}")
+    return value
+
+
+def _positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def _common_options(body, request_timeout):
+    mode = _option(body, "mode", lambda v: v in langchain_config.SUMMARY_MODES,
+                   f"one of {', '.join(langchain_config.SUMMARY_MODES)}")
+    timeout = _option(body, "timeout", _positive_number, "a positive number of seconds", request_timeout)
+    return mode, float(timeout)
+
+
+class ApiServer:
+    def __init__(self, max_concurrency=32, max_pending=128, max_batch=50, request_timeout=60,
+                 max_body_bytes=1 << 20, stream_buffer=8):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.stream_buffer = stream_buffer
+        # Blocking pipeline calls (and stream producers) run here, one thread per admitted request
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="api")
+        self._slots = None
+        self._waiting = 0
+        self._server = None
+
+    async def _admit(self):
+        if self._slots.locked() and self._waiting >= self.max_pending:
+            metrics.inc("api_rejected_total")
+            raise HttpError(503, "Server is at capacity; retry shortly", {"Retry-After": "1"})
+        self._waiting += 1
+        metrics.set_gauge("api_waiting_requests", self._waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+            metrics.set_gauge("api_waiting_requests", self._waiting)
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: ctx.run(fn, *args, **kwargs))
+
+    async def summary(self, body):
+        query = body.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise HttpError(400, "'query' must be a non-empty string")
+        query = query.strip()
+        mode, timeout = _common_options(body, self.request_timeout)
+        fuzzy = _option(body, "fuzzy", lambda v: isinstance(v, bool), "true or false")
+        try:
+            result = await self._run_blocking(langchain_config.get_summary_with_status, query, timeout=timeout,
+                                              mode=mode, fuzzy=fuzzy)
+        except TimeoutError:
+            raise HttpError(504, f"No summary within {timeout}s")
+        return _result_json({"query": query, **result})
+
+    async def summaries(self, body):
+        queries = body.get("queries")
+        if (not isinstance(queries, list) or not queries
+                or not all(isinstance(q, str) and q.strip() for q in queries)):
+            raise HttpError(400, "'queries' must be a non-empty list of non-empty strings")
+        if len(queries) > self.max_batch:
+            raise HttpError(413, f"At most {self.max_batch} queries per batch")
+        mode, timeout = _common_options(body, self.request_timeout)
+        concurrency = _option(body, "concurrency", lambda v: isinstance(v, int) and not isinstance(v, bool) and v > 0,
+                              "a positive integer", 8)
+        results = await langchain_config.aget_summaries(
+            [q.strip() for q in queries], concurrency=min(concurrency, self.max_concurrency),
+            timeout=timeout, mode=mode,
+        )
+        return {"results": [_result_json(r) for r in results]}
+
+    async def stream(self, query, writer):
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue(maxsize=self.stream_buffer)
+        closed = threading.Event()
+
+        def emit(event, data):
+            if closed.is_set():
+                raise ConnectionAbortedError("client went away")
+            # Blocks this connection's reader thread while the queue is full; the shared LLM stream carries on
+            asyncio.run_coroutine_threadsafe(events.put((event, data)), loop).result()
+
+        def produce():
+            try:
+                chunks, articles = langchain_config.stream_summary(query)
+                emit("articles", [a.to_dict() for a in articles])
+                for bullet in langchain_config.stream_bullets(chunks):
+                    emit("bullet", bullet)
+                emit("done", None)
+            except Exception as exc:
+                if not closed.is_set():
+                    emit("error", exc)
+
+        producer = asyncio.ensure_future(self._run_blocking(produce))
+        try:
+            event, data = await events.get()
+            if event == "error":
+                # Nothing is sent yet, so _handle answers with the matching status (429, 503, 500)
+                raise data
+            self._write_head(writer, 200, "text/event-stream; charset=utf-8", None, False, {"Cache-Control": "no-cache"})
+            # From here on the response has started: failures become an error event or just close
+            try:
+                while True:
+                    if event == "error":
+                        data = f"{type(data).__name__}: {data}"
+                    writer.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    await writer.drain()
+                    if event in ("done", "error"):
+                        break
+                    event, data = await events.get()
+            except ConnectionError:
+                metrics.inc("api_stream_disconnects_total")
+        finally:
+            # Unblock a producer waiting on a full queue; its next emit stops it
+            closed.set()
+            while not events.empty():
+                events.get_nowait()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _read_request(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method, target, version = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > self.max_body_bytes:
+            raise HttpError(413, f"Body larger than {self.max_body_bytes} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target, body, keep_alive
+
+    @staticmethod
+    def _write_head(writer, status, content_type, length, keep_alive, headers=None):
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    def _write_body(self, writer, status, content_type, body, keep_alive, headers=None):
+        self._write_head(writer, status, content_type, len(body), keep_alive, headers)
+        writer.write(body)
+
+    def _write_json(self, writer, status, payload, keep_alive, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._write_body(writer, status, "application/json; charset=utf-8", body, keep_alive, headers)
+
+    async def _dispatch(self, method, target, body, writer):
+        url = urlsplit(target)
+        if url.path == "/healthz":
+            return {"status": "ok", "llm_available": langchain_config.llm_available()}
+        if url.path == "/metrics":
+            return metrics.REGISTRY.render_prometheus()
+        routes = {"/v1/summary": ("POST", self.summary), "/v1/summaries": ("POST", self.summaries),
+                  "/v1/stream": ("GET", None)}
+        if url.path not in routes:
+            raise HttpError(404, f"No route for {url.path}")
+        if method != routes[url.path][0]:
+            raise HttpError(405, f"Use {routes[url.path][0]} for {url.path}")
+
+        if url.path == "/v1/stream":
+            query = (parse_qs(url.query).get("query") or [""])[0].strip()
+            if not query:
+                raise HttpError(400, "'query' is required")
+        else:
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise HttpError(400, "Body must be JSON")
+            if not isinstance(payload, dict):
+                raise HttpError(400, "Body must be a JSON object")
+
+        await self._admit()
+        try:
+            with metrics.timed(f"api{url.path.replace('/', '_')}"):
+                if url.path == "/v1/stream":
+                    await self.stream(query, writer)
+                    return None
+                return await routes[url.path][1](payload)
+        finally:
+            self._slots.release()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    method, target, body, keep_alive = await self._read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except (asyncio.LimitOverrunError, ValueError):
+                    self._write_json(writer, 400, {"error": "Malformed request"}, False)
+                    return
+                except HttpError as exc:
+                    self._write_json(writer, exc.status, {"error": str(exc)}, False, exc.headers)
+                    return
+                try:
+                    payload = await self._dispatch(method, target, body, writer)
+                except HttpError as exc:
+                    self._write_json(writer, exc.status, {"error": str(exc)}, keep_alive, exc.headers)
+                except QuotaExceededError as exc:
+                    self._write_json(writer, 429, {"error": str(exc)}, keep_alive)
+                except CircuitOpenError as exc:
+                    self._write_json(writer, 503, {"error": str(exc)}, keep_alive, {"Retry-After": "30"})
+                except ConnectionError:
+                    return
+                except Exception as exc:
+                    logger.exception("Request %s %s failed", method, target)
+                    self._write_json(writer, 500, {"error": f"{type(exc).__name__}: {exc}"}, keep_alive)
+                else:
+                    if payload is None:  # a stream; the connection is done
+                        return
+                    if isinstance(payload, str):
+                        self._write_body(writer, 200, "text/plain; version=0.0.4; charset=utf-8",
+                                         payload.encode("utf-8"), keep_alive)
+                    else:
+                        self._write_json(writer, 200, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="0.0.0.0", port=8080):
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def serve_forever(self, host="0.0.0.0", port=8080):
+        server = await self.start(host, port)
+        logger.info("Serving on %s", ", ".join(str(s.getsockname()) for s in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve news summaries over HTTP/JSON.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=32, help="requests processed at once")
+    parser.add_argument("--max-pending", type=int, default=128, help="requests queued before 503s")
+    parser.add_argument("--max-batch", type=int, default=50, help="queries per /v1/summaries call")
+    parser.add_argument("--timeout", type=float, default=60, help="default per-summary timeout in seconds")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = ApiServer(max_concurrency=args.max_concurrency, max_pending=args.max_pending,
+                       max_batch=args.max_batch, request_timeout=args.timeout)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import sys
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+
+UNKNOWN_SOURCE = "Unknown Source"
+
+
+def parse_published(value):
+    """NewsAPI ``publishedAt`` ("2025-09-25T10:00:00Z") as an aware UTC datetime, or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """The fields of a NewsAPI article the pipeline uses, without the raw JSON around them.
+
+    Source names are interned, so the handful of publishers are stored once
+    however many cached articles refer to them. ``full_text`` is set by
+    enrichment and ``folded_sources`` by dedup; use ``with_changes`` to derive.
+    """
+
+    title: str = ""
+    source: str = UNKNOWN_SOURCE
+    url: str = ""
+    published_at: datetime = None
+    description: str = ""
+    content: str = ""
+    full_text: str = None
+    folded_sources: tuple = ()
+
+    @classmethod
+    def from_newsapi(cls, raw):
+        return cls(
+            title=raw.get("title") or "",
+            source=sys.intern((raw.get("source") or {}).get("name") or UNKNOWN_SOURCE),
+            url=raw.get("url") or "",
+            published_at=parse_published(raw.get("publishedAt")),
+            description=raw.get("description") or "",
+            content=raw.get("content") or "",
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of ``to_dict``."""
+        return cls(
+            title=data.get("title") or "",
+            source=sys.intern(data.get("source") or UNKNOWN_SOURCE),
+            url=data.get("url") or "",
+            published_at=parse_published(data.get("publishedAt")),
+            description=data.get("description") or "",
+            content=data.get("content") or "",
+            folded_sources=tuple(data.get("folded_sources") or ()),
+        )
+
+    def to_dict(self):
+        """Flat JSON-ready form; ``full_text`` is left out (the page cache keeps it)."""
+        return {
+            "title": self.title,
+            "source": self.source,
+            "url": self.url,
+            "publishedAt": self.published_iso,
+            "description": self.description,
+            "content": self.content,
+            "folded_sources": list(self.folded_sources),
+        }
+
+    @property
+    def published_iso(self):
+        return self.published_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.published_at else ""
+
+    @property
+    def text(self):
+        """Best available body: enriched full text, else description, else NewsAPI's truncated content."""
+        return self.full_text or self.description or self.content
+
+    @property
+    def headline_text(self):
+        """Title plus description (or truncated content): the text dedup and ranking compare."""
+        return f"{self.title} {self.description or self.content}"
+
+    def with_changes(self, **changes):
+        return replace(self, **changes)
@@ -0,0 +1,155 @@
+"""Headless batch runner for the news summary pipeline.
+
+Reads one query per line from a file (or stdin with ``-``), fans them out over
+a process pool and streams one JSON object per query to the output as each
+finishes. Re-running with ``--resume`` skips queries that already have a
+successful line in the output file.
+
+Usage:
+    python batch_cli.py topics.txt -o briefing.jsonl --workers 8 --reports-dir reports --pdf
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def read_queries(source):
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    with stream:
+        queries = [line.strip() for line in stream]
+    return [q for q in queries if q and not q.startswith("#")]
+
+
+def completed_queries(output_path):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if record.get("error") is None:
+                done.add(record["query"])
+    return done
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:60] or "query"
+
+
+def _stage_totals():
+    import metrics
+
+    return {
+        dict(key)["stage"]: hist["sum"]
+        for (name, key), hist in metrics.REGISTRY.snapshot()["histograms"].items()
+        if name == "news_stage_duration_seconds"
+    }
+
+
+def _article_record(article):
+    return {
+        "title": article.title,
+        "source": article.source,
+        "url": article.url,
+        "publishedAt": article.published_iso or None,
+        "folded_sources": list(article.folded_sources),
+    }
+
+
+def init_worker(workers):
+    """Pool initializer: each worker process gets 1/``workers`` of the provider rate limits and quotas."""
+    import langchain_config
+
+    langchain_config.configure_limiters(share=workers)
+
+
+def run_query(index, query, mode, reports_dir, pdf):
+    """Runs in a worker process; each worker handles one query at a time, so stage deltas are per query."""
+    from langchain_config import get_summary_with_status
+    from scheduler import BATCH, priority
+
+    before = _stage_totals()
+    start = time.perf_counter()
+    record = {"query": query, "summary": None, "articles": [], "stale": False, "error": None}
+    try:
+        with priority(BATCH):
+            result = get_summary_with_status(query, mode=mode)
+        record.update(summary=result["summary"], stale=result["stale"],
+                      articles=[_article_record(a) for a in result["articles"]])
+        if reports_dir:
+            record["reports"] = write_reports(index, query, result["summary"], result["articles"], reports_dir, pdf)
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    after = _stage_totals()
+    record["timings"] = {
+        "total_seconds": round(time.perf_counter() - start, 4),
+        **{f"{stage}_seconds": round(after[stage] - before.get(stage, 0.0), 4) for stage in after},
+    }
+    return record
+
+
+def write_reports(index, query, summary, articles, reports_dir, pdf):
+    from reports import build_report, create_pdf, format_articles_text, split_summary
+
+    header_line, formatted_summary = split_summary(summary, articles)
+    report = build_report(query, header_line, formatted_summary, format_articles_text(articles[:3]))
+    base = os.path.join(reports_dir, f"{index:04d}-{_slug(query)}")
+    paths = [base + ".txt"]
+    with open(paths[0], "w", encoding="utf-8") as f:
+        f.write(report)
+    if pdf:
+        paths.append(base + ".pdf")
+        with open(paths[1], "wb") as f:
+            f.write(create_pdf(report).getvalue())
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize many news queries without the dashboard.")
+    parser.add_argument("queries", help="file with one query per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--mode", choices=("single", "map_reduce", "auto"), default=None)
+    parser.add_argument("--resume", action="store_true", help="skip queries already completed in --output")
+    parser.add_argument("--reports-dir", help="also write a TXT report per query here")
+    parser.add_argument("--pdf", action="store_true", help="with --reports-dir, write PDF reports too")
+    args = parser.parse_args(argv)
+
+    # Numbered before --resume filtering so report file names stay stable across runs
+    queries = list(enumerate(read_queries(args.queries), 1))
+    if args.resume and args.output != "-":
+        done = completed_queries(args.output)
+        queries = [(i, q) for i, q in queries if q not in done]
+    workers = max(1, min(args.workers, len(queries)))
+    if args.reports_dir:
+        os.makedirs(args.reports_dir, exist_ok=True)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "a" if args.resume else "w", encoding="utf-8")
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(workers,)) as pool:
+            futures = [
+                pool.submit(run_query, i, q, args.mode, args.reports_dir, args.pdf)
+                for i, q in queries
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                failures += record["error"] is not None
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(queries) - failures}/{len(queries)} queries summarized", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Offline benchmark of the summary pipeline.
+
+NewsAPI and the Groq LLM are replaced with local stand-ins whose latency and
+payload size are configurable, so the pipeline can be measured without keys
+or network access. Each run goes through the same stages as the dashboard:
+
+    fetch -> context build -> LLM -> bullet parse -> PDF
+
+and reports per-stage p50/p95 latency, end-to-end throughput at several
+concurrency levels and peak Python memory (from a separate tracemalloc pass,
+so tracing never inflates the latencies). ``--save-baseline`` writes the
+numbers to JSON; ``--compare`` checks a run against a saved baseline and exits
+non-zero when a stage's p95 regresses past ``--tolerance``.
+
+Usage: python benchmarks/pipeline.py [--runs 30] [--concurrency 1 4 16]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import langchain_config  # noqa: E402
+from reports import build_report, create_pdf, format_articles_text, split_summary  # noqa: E402
+
+STAGES = ("fetch", "context", "llm", "parse", "pdf")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+_VOCABULARY = (
+    "government officials said troops border talks ceasefire minister market shares rally "
+    "technology model launch startup funding video agents match innings wickets captain "
+    "election vote court ruling storm flood rescue energy prices oil summit leaders"
+).split()
+
+
+class FakeNewsApi:
+    """Stands in for ``NewsApiClient.get_everything`` with synthetic articles."""
+
+    def __init__(self, latency=0.2, words_per_article=60, sources=8):
+        self.latency = latency
+        self.words_per_article = words_per_article
+        self.sources = sources
+
+    def get_everything(self, q=None, page=1, page_size=10, **kwargs):
+        time.sleep(self.latency)
+        rng = random.Random(f"{q}|{page}")
+        articles = []
+        for i in range(page_size):
+            n = (page - 1) * page_size + i
+            words = [rng.choice(_VOCABULARY) for _ in range(self.words_per_article)]
+            articles.append({
+                "source": {"id": None, "name": f"Outlet {n % self.sources}"},
+                "title": f"{q} update {n}",
+                "description": ' '.join(words[: self.words_per_article // 2]).capitalize() + ".",
+                "content": ' '.join(words).capitalize() + ". [+1200 chars]",
+                "url": f"https://news.example/{abs(hash(q))}/{n}",
+                "publishedAt": f"2025-09-25T{n % 24:02d}:00:00Z",
+            })
+        return {"status": "ok", "totalResults": 100, "articles": articles}
+
+
+def make_fake_llm(latency=1.0, bullets=6, words_per_bullet=20):
+    from langchain_core.language_models.chat_models import SimpleChatModel
+
+    class FakeChatModel(SimpleChatModel):
+        """Returns a fixed-size bullet summary after a fixed delay."""
+
+        latency: float = 1.0
+        bullets: int = 6
+        words_per_bullet: int = 20
+
+        @property
+        def _llm_type(self):
+            return "fake-benchmark-chat"
+
+        def _call(self, messages, stop=None, run_manager=None, **kwargs):
+            time.sleep(self.latency)
+            rng = random.Random(len(str(messages)))
+            return "\n".join(
+                "• " + ' '.join(rng.choice(_VOCABULARY) for _ in range(self.words_per_bullet)).capitalize()
+                for _ in range(self.bullets)
+            )
+
+    return FakeChatModel(latency=latency, bullets=bullets, words_per_bullet=words_per_bullet)
+
+
+def run_pipeline(query, timings=None):
+    def timed(stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        if timings is not None:
+            timings[stage].append(time.perf_counter() - start)
+        return result
+
+    articles = timed("fetch", langchain_config.get_news_articles, query)
+    used_articles, summaries = timed("context", langchain_config.build_prompt_context, query, articles)
+    # The production LLM path: model cascade, Groq limiter and circuit breaker
+    response = timed("llm", langchain_config._summarize, query, summaries, len(used_articles))
+    header_line, formatted_summary = timed("parse", split_summary, response, used_articles)
+    report = build_report(query, header_line, formatted_summary, format_articles_text(used_articles[:3]))
+    timed("pdf", create_pdf, report)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(runs, concurrency_levels):
+    queries = [f"topic {i}" for i in range(runs)]
+    timings = {stage: [] for stage in STAGES}
+
+    # Latencies come from an untraced pass; tracemalloc slows allocation-heavy stages several-fold
+    for query in queries:
+        run_pipeline(query, timings)
+
+    tracemalloc.start()
+    for query in queries:
+        run_pipeline(query)
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    throughput = {}
+    for level in concurrency_levels:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            list(pool.map(run_pipeline, queries))
+        throughput[str(level)] = runs / (time.perf_counter() - start)
+
+    return {
+        "stages": {
+            stage: {
+                "p50_ms": statistics.median(samples) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+            }
+            for stage, samples in timings.items()
+        },
+        "throughput_per_s": throughput,
+        "peak_memory_mb": peak_bytes / (1024 * 1024),
+    }
+
+
+def print_report(result, baseline=None):
+    print(f"{'stage':<10}{'p50 ms':>12}{'p95 ms':>12}{'vs baseline p95':>18}")
+    for stage, stats in result["stages"].items():
+        delta = ""
+        if baseline and stage in baseline["stages"]:
+            base = baseline["stages"][stage]["p95_ms"]
+            delta = f"{(stats['p95_ms'] - base) / base * 100:+.1f}%" if base else "n/a"
+        print(f"{stage:<10}{stats['p50_ms']:>12.2f}{stats['p95_ms']:>12.2f}{delta:>18}")
+    for level, rate in result["throughput_per_s"].items():
+        print(f"throughput @ concurrency {level:>3}: {rate:8.2f} pipelines/s")
+    print(f"peak memory: {result['peak_memory_mb']:.2f} MB")
+
+
+def regressions(result, baseline, tolerance):
+    failed = []
+    for stage, stats in result["stages"].items():
+        base = baseline["stages"].get(stage, {}).get("p95_ms")
+        if base and stats["p95_ms"] > base * (1 + tolerance):
+            failed.append(stage)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--news-latency", type=float, default=0.2)
+    parser.add_argument("--words-per-article", type=int, default=60)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--bullets", type=int, default=6)
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE)
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 regression, e.g. 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    langchain_config.set_clients(
+        newsapi=FakeNewsApi(latency=args.news_latency, words_per_article=args.words_per_article),
+        llm=make_fake_llm(latency=args.llm_latency, bullets=args.bullets),
+    )
+    result = measure(args.runs, args.concurrency)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if baseline:
+        failed = regressions(result, baseline, args.tolerance)
+        if failed:
+            print(f"p95 regression beyond {args.tolerance:.0%} in: {', '.join(failed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Cold-start benchmark for the dashboard.
+
+Each sample runs in a fresh interpreter so nothing is already imported:
+
+* import time of ``langchain_config`` (what every replica pays before serving)
+* time to first render of ``news.py`` (a full script run up to the login
+  screen, via Streamlit's ``AppTest`` harness)
+
+Usage: python benchmarks/startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    "import langchain_config": (
+        "import time; t = time.perf_counter(); import langchain_config; "
+        "print(time.perf_counter() - t)"
+    ),
+    "first render news.py": (
+        "import time; t = time.perf_counter(); "
+        "from streamlit.testing.v1 import AppTest; "
+        "AppTest.from_file('news.py', default_timeout=60).run(); "
+        "print(time.perf_counter() - t)"
+    ),
+}
+
+
+def time_in_fresh_process(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for label, code in SNIPPETS.items():
+        try:
+            samples = [time_in_fresh_process(code) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as exc:
+            print(f"{label:<24} failed: {exc.stderr.strip().splitlines()[-1] if exc.stderr else exc}")
+            continue
+        print(f"{label:<24} median {statistics.median(samples) * 1000:8.1f} ms"
+              f"   min {min(samples) * 1000:8.1f} ms   ({args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import math
+import re
+from collections import Counter
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'“])")
+# NewsAPI appends "… [+1234 chars]" to truncated content
+_TRUNCATION_RE = re.compile(r"\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in is it its of on or "
+    "said says she that the their they this to was were will with".split()
+)
+
+
+def count_tokens(text):
+    # Word/punctuation pieces track LLM BPE counts closely enough for budgeting
+    return len(_TOKEN_RE.findall(text or ''))
+
+
+def split_sentences(text):
+    text = _TRUNCATION_RE.sub('', (text or '').strip())
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def words(text):
+    """Lowercased alphanumeric words; the tokenizer shared by dedup, ranking and validation."""
+    return _WORD_RE.findall((text or '').lower())
+
+
+def content_terms(text):
+    return [w for w in words(text) if w not in STOPWORDS]
+
+
+def _tfidf(counts, idf):
+    vec = {term: (1 + math.log(tf)) * idf.get(term, 0.0) for term, tf in counts.items()}
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {term: v / norm for term, v in vec.items()}
+
+
+def build_context(query, articles, token_budget=2000, lead_bonus=0.1):
+    """Packs the sentences most relevant to the query into ``token_budget`` tokens.
+
+    Returns ``(context, stats)``; sentences keep their original article order and
+    ``stats`` reports ``tokens_in``, ``tokens_out`` and ``tokens_saved``.
+    """
+    sentences = []
+    for article in articles:
+        text = article.text
+        for position, sentence in enumerate(split_sentences(text)):
+            sentences.append((sentence, position == 0))
+
+    tokens = [count_tokens(s) for s, _ in sentences]
+    tokens_in = sum(tokens)
+    if not token_budget or tokens_in <= token_budget:
+        context = ' '.join(s for s, _ in sentences)
+        return context, {"tokens_in": tokens_in, "tokens_out": tokens_in, "tokens_saved": 0}
+
+    term_counts = [Counter(content_terms(s)) for s, _ in sentences]
+    doc_freq = Counter(term for counts in term_counts for term in counts)
+    total = len(sentences)
+    idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in doc_freq.items()}
+    query_vec = _tfidf(Counter(content_terms(query)), idf)
+
+    scores = []
+    for idx, counts in enumerate(term_counts):
+        vec = _tfidf(counts, idf)
+        relevance = sum(weight * vec.get(term, 0.0) for term, weight in query_vec.items())
+        scores.append(relevance + (lead_bonus if sentences[idx][1] else 0.0))
+
+    chosen, used = set(), 0
+    for idx in sorted(range(total), key=lambda i: (-scores[i], i)):
+        if used + tokens[idx] <= token_budget:
+            chosen.add(idx)
+            used += tokens[idx]
+
+    context = ' '.join(sentences[i][0] for i in sorted(chosen))
+    return context, {"tokens_in": tokens_in, "tokens_out": used, "tokens_saved": tokens_in - used}
@@ -0,0 +1,64 @@
+import hashlib
+import random
+
+from context_builder import words
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def _permutations(num_perm, seed=1):
+    rng = random.Random(seed)
+    return [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+def shingles(text, size=3):
+    tokens = words(text)
+    if len(tokens) < size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures over word shingles; signature agreement estimates Jaccard similarity."""
+
+    def __init__(self, num_perm=64, shingle_size=3, seed=1):
+        self.shingle_size = shingle_size
+        self._perms = _permutations(num_perm, seed)
+
+    def signature(self, text):
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+            for s in shingles(text, self.shingle_size)
+        ]
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def dedupe_articles(articles, threshold=0.7, hasher=None):
+    """Keeps the first article of each near-duplicate cluster, in the original order.
+
+    Each kept article is a copy with ``folded_sources`` listing the source
+    names of the syndicated copies merged into it.
+    """
+    hasher = hasher or MinHasher()
+    kept, folded, signatures = [], [], []
+    for article in articles:
+        sig = hasher.signature(article.headline_text)
+        match = None
+        if sig is not None:
+            for idx, other in enumerate(signatures):
+                if other is not None and hasher.similarity(sig, other) >= threshold:
+                    match = idx
+                    break
+        if match is None:
+            kept.append(article)
+            folded.append([])
+            signatures.append(sig)
+        else:
+            folded[match].append(article.source)
+    return [article.with_changes(folded_sources=tuple(sources)) for article, sources in zip(kept, folded)]
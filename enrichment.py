@@ -0,0 +1,219 @@
+"""Full-text enrichment for NewsAPI articles.
+
+NewsAPI truncates ``content`` to ~200 characters. ``enrich_articles`` fetches
+each article URL concurrently (per-host connection limits, a strict per-article
+time budget), extracts the main text and returns ``Article`` copies carrying it
+as ``full_text``. Extracted text lives in an on-disk, content-addressed cache: a
+URL maps to the SHA-256 of its text, and the text is stored once under that
+hash, so a repeat article is never downloaded twice. Pages that fail, time out
+or extract to too little text (paywalls) are remembered too and not retried
+until ``retry_after`` seconds have passed.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import metrics
+
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure"})
+_BLOCK_TAGS = frozenset({"p", "h2", "h3", "li", "blockquote"})
+
+
+class _MainTextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.block = None
+        self.blocks = []  # (text, inside <article>)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == "article":
+            self.article_depth += 1
+        elif tag in _BLOCK_TAGS and not self.skip_depth:
+            self.block = []
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "article":
+            self.article_depth = max(0, self.article_depth - 1)
+        elif tag in _BLOCK_TAGS and self.block is not None:
+            text = " ".join("".join(self.block).split())
+            if text:
+                self.blocks.append((text, self.article_depth > 0))
+            self.block = None
+
+    def handle_data(self, data):
+        if self.block is not None and not self.skip_depth:
+            self.block.append(data)
+
+
+def extract_main_text(html, min_block_chars=40):
+    """Paragraph text of a page, preferring what sits inside ``<article>``."""
+    parser = _MainTextParser()
+    parser.feed(html)
+    parser.close()
+    blocks = [(text, in_article) for text, in_article in parser.blocks if len(text) >= min_block_chars]
+    if any(in_article for _, in_article in blocks):
+        blocks = [b for b in blocks if b[1]]
+    return "\n".join(text for text, _ in blocks)
+
+
+class PageCache:
+    """On-disk text cache: ``urls/<sha256(url)>`` holds a content hash, ``texts/<hash>`` the text.
+
+    ``misses/<sha256(url)>`` marks a URL that yielded nothing; its mtime says when.
+    """
+
+    def __init__(self, directory, retry_after=21600):
+        self.directory = directory
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        for sub in ("urls", "texts", "misses"):
+            os.makedirs(os.path.join(directory, sub), exist_ok=True)
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _url_path(self, url):
+        return os.path.join(self.directory, "urls", self._digest(url))
+
+    def _text_path(self, content_hash):
+        return os.path.join(self.directory, "texts", content_hash)
+
+    def _miss_path(self, url):
+        return os.path.join(self.directory, "misses", self._digest(url))
+
+    def failed_recently(self, url):
+        try:
+            return time.time() - os.path.getmtime(self._miss_path(url)) < self.retry_after
+        except OSError:
+            return False
+
+    def set_failed(self, url, reason):
+        with self._lock:
+            self._write(self._miss_path(url), reason)
+
+    def get(self, url):
+        try:
+            with open(self._url_path(url), encoding="utf-8") as f:
+                content_hash = f.read().strip()
+            with open(self._text_path(content_hash), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, url, text):
+        content_hash = self._digest(text)
+        with self._lock:
+            text_path = self._text_path(content_hash)
+            if not os.path.exists(text_path):
+                self._write(text_path, text)
+            self._write(self._url_path(url), content_hash)
+        return content_hash
+
+    @staticmethod
+    def _write(path, value):
+        # Write-then-rename so a crash never leaves a half-written entry behind
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp, path)
+
+
+async def _download(client, url, max_bytes):
+    chunks, size = [], 0
+    async with client.stream("GET", url, follow_redirects=True) as response:
+        response.raise_for_status()
+        if "html" not in response.headers.get("content-type", "text/html"):
+            return None
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        encoding = response.encoding or "utf-8"
+    return b"".join(chunks).decode(encoding, errors="replace")
+
+
+async def _enrich_one(client, article, cache, host_limits, per_host, budget, max_bytes, min_chars):
+    url = article.url
+    if not url or not url.startswith(("http://", "https://")):
+        return article
+    text = cache.get(url) if cache is not None else None
+    if text is not None:
+        metrics.inc("enrichment_requests_total", result="cached")
+    elif cache is not None and cache.failed_recently(url):
+        metrics.inc("enrichment_requests_total", result="skipped")
+        return article
+    else:
+        host = urlsplit(url).netloc.lower()
+        limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+
+        async def fetch():
+            async with limit:
+                return await _download(client, url, max_bytes)
+
+        try:
+            # The budget covers waiting for a host slot too, so one slow publisher can't stall the batch
+            html = await asyncio.wait_for(fetch(), budget)
+        except asyncio.TimeoutError:
+            metrics.inc("enrichment_requests_total", result="timeout")
+            if cache is not None:
+                cache.set_failed(url, "timeout")
+            return article
+        except Exception:
+            metrics.inc("enrichment_requests_total", result="error")
+            if cache is not None:
+                cache.set_failed(url, "error")
+            return article
+        text = extract_main_text(html) if html else ""
+        if cache is not None:
+            if len(text) >= min_chars:
+                cache.set(url, text)
+            else:
+                cache.set_failed(url, "too_short")
+        metrics.inc("enrichment_requests_total", result="fetched")
+    if len(text) < min_chars:
+        return article
+    return article.with_changes(full_text=text)
+
+
+async def aenrich_articles(articles, cache=None, per_host=2, max_connections=20, budget=3.0,
+                           connect_timeout=2.0, max_bytes=2_000_000, min_chars=300, client=None):
+    """Returns the articles in order, each with ``full_text`` when its page yielded enough text.
+
+    Articles that time out, fail or extract to less than ``min_chars`` come back unchanged.
+    """
+    articles = list(articles)
+    own_client = client is None
+    if own_client:
+        import httpx
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(budget, connect=connect_timeout),
+            headers={"User-Agent": "Mozilla/5.0 (compatible; news-summarizer)"},
+        )
+    host_limits = {}
+    try:
+        with metrics.timed("enrichment"):
+            return await asyncio.gather(*(
+                _enrich_one(client, a, cache, host_limits, per_host, budget, max_bytes, min_chars) for a in articles
+            ))
+    finally:
+        if own_client:
+            await client.aclose()
+
+
+def enrich_articles(articles, **kwargs):
+    """Blocking wrapper around ``aenrich_articles`` for the threaded pipeline."""
+    return asyncio.run(aenrich_articles(articles, **kwargs))
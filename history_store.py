@@ -0,0 +1,81 @@
+import re
+import sqlite3
+import threading
+import time
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(text):
+    # Quote every term so user input can't inject FTS5 syntax; trailing * = prefix match
+    return ' '.join(f'"{term}"*' for term in _TERM_RE.findall(text or ''))
+
+
+class HistoryStore:
+    """Per-user query history in SQLite, with an FTS5 index over queries and summaries."""
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY,
+                user TEXT NOT NULL,
+                query TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS history_user_created ON history (user, created);
+            CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+                query, summary, content='history', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+                INSERT INTO history_fts (rowid, query, summary) VALUES (new.id, new.query, new.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+                INSERT INTO history_fts (history_fts, rowid, query, summary)
+                VALUES ('delete', old.id, old.query, old.summary);
+            END;
+        """)
+        self._db.commit()
+
+    def add(self, user, query, summary):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO history (user, query, summary, created) VALUES (?, ?, ?, ?)",
+                (user, query, summary, time.time())
+            )
+            self._db.commit()
+
+    def count(self, user):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM history WHERE user = ?", (user,)).fetchone()[0]
+
+    def page(self, user, page=0, per_page=5):
+        """Newest first; ``page`` is zero-based."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, query, summary, created FROM history WHERE user = ? "
+                "ORDER BY created DESC, id DESC LIMIT ? OFFSET ?",
+                (user, per_page, page * per_page)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, user, text, limit=10):
+        match = _fts_query(text)
+        if not match:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT h.id, h.query, h.summary, h.created FROM history_fts "
+                "JOIN history h ON h.id = history_fts.rowid "
+                "WHERE history_fts MATCH ? AND h.user = ? ORDER BY bm25(history_fts) LIMIT ?",
+                (match, user, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def clear(self, user):
+        with self._lock:
+            self._db.execute("DELETE FROM history WHERE user = ?", (user,))
+            self._db.commit()
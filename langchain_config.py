@@ -1,66 +1,727 @@
-import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
-from newsapi import NewsApiClient
- 
-load_dotenv()
-groq_api_key = os.getenv("GROQ_API_KEY")
-news_api_key = os.getenv("NEWS_API_KEY")
- 
-llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.3-70b-versatile", temperature=0.3)
- 
- 
-enhanced_template = """
-You are an intelligent and unbiased AI summarizer.
- 
-Your job is to summarize real-time news based on the provided articles and the user query.
- 
-✅ Please ensure:
-• The summary is accurate, factual, and fresh
-• The summary must clearly cover the full incident, including place, time and reflect all relevant and recent developments, if any.
-• Each bullet starts with a strong unique point or fact with no repitition
-• Use exactly 5 to 8 bullets, prefixed with "•"
-• Avoid repeating the query or giving generic summaries
-• Start the summary with your strongest bullet — do NOT prefix it with any label like 'Top News Header'
-• Do NOT add conclusions, advice, or any extra fluff
-• NEVER invent information — rely strictly on what’s in the article content
- 
----
- 
-📝 User Query:
-{query}
- 
-📰 News Article Content:
-{summaries}
- 
----
- 
-📌 Return only the final bullet-point summary below:
-"""
- 
-prompt = PromptTemplate(template=enhanced_template, input_variables=["query", "summaries"])
-llm_chain = LLMChain(prompt=prompt, llm=llm)
-newsapi = NewsApiClient(api_key=news_api_key)
- 
-def get_news_articles(query):
-    return newsapi.get_everything(q=query, language='en', sort_by='publishedAt', page_size=10).get("articles", [])
- 
-def summarize_articles(articles):
-    return ' '.join(
-        article.get('description') or article.get('content') or ''
-        for article in articles
-    )
-   
-def get_summary(query):
-    articles = get_news_articles(query)
-    summaries = summarize_articles(articles)
- 
-    if not summaries.strip():
-        return "⚠️ No content found to summarize. Try another topic.", []
- 
-    used_articles = [a for a in articles if a.get('description') or a.get('content')]
-    summary_output = llm_chain.run(query=query, summaries=summaries)
- 
-    return summary_output, used_articles
\ No newline at end of file
+import asyncio
+import contextvars
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+import metrics
+from article import Article
+from context_builder import build_context, count_tokens
+from dedup import dedupe_articles
+from enrichment import PageCache, enrich_articles
+from model_router import LARGE, SMALL, choose_model, validation_problems
+from query_match import QueryIndex
+from relevance_index import RelevanceIndex
+from scheduler import BATCH, INTERACTIVE, ProviderLimiter, current_priority, priority
+from singleflight import SingleFlight, StreamFlight
+from summary_cache import SummaryCache, make_cache_key, normalize_query
+from transport import (CircuitBreaker, CircuitOpenError, build_http_session, build_httpx_client,
+                       hedged_call, retry_call)
+ 
+load_dotenv()
+logger = logging.getLogger(__name__)
+groq_api_key = os.getenv("GROQ_API_KEY")
+news_api_key = os.getenv("NEWS_API_KEY")
+ 
+# Shared keep-alive transport settings for NewsAPI and Groq
+http_pool_size = int(os.getenv("HTTP_POOL_SIZE", "20"))
+http_connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+news_read_timeout = float(os.getenv("NEWS_READ_TIMEOUT", "10"))
+news_retries = int(os.getenv("NEWS_RETRIES", "3"))
+llm_read_timeout = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+llm_max_retries = int(os.getenv("LLM_MAX_RETRIES", "2"))
+# Hedging fires a second NewsAPI attempt once the first outlives the observed p95
+news_hedge = os.getenv("NEWS_HEDGE", "0") == "1"
+news_hedge_default_delay = float(os.getenv("NEWS_HEDGE_DELAY", "1.5"))
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="newsapi-hedge")
+# Model cascade: light requests (prompt and article count under the limits) go to
+# the small model first and escalate to the large one when the output fails
+# validation (empty, wrong bullet count, bullets not backed by the articles)
+llm_model = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+llm_small_model = os.getenv("LLM_SMALL_MODEL", "llama-3.1-8b-instant")
+llm_cascade = os.getenv("LLM_CASCADE", "1") == "1"
+small_model_max_prompt_tokens = int(os.getenv("SMALL_MODEL_MAX_PROMPT_TOKENS", "800"))
+small_model_max_articles = int(os.getenv("SMALL_MODEL_MAX_ARTICLES", "4"))
+ 
+ 
+enhanced_template = """
+You are an intelligent and unbiased AI summarizer.
+ 
+Your job is to summarize real-time news based on the provided articles and the user query.
+ 
+✅ Please ensure:
+• The summary is accurate, factual, and fresh
+• The summary must clearly cover the full incident, including place, time and reflect all relevant and recent developments, if any.
+• Each bullet starts with a strong unique point or fact with no repitition
+• Use exactly 5 to 8 bullets, prefixed with "•"
+• Avoid repeating the query or giving generic summaries
+• Start the summary with your strongest bullet — do NOT prefix it with any label like 'Top News Header'
+• Do NOT add conclusions, advice, or any extra fluff
+• NEVER invent information — rely strictly on what’s in the article content
+ 
+---
+ 
+📝 User Query:
+{query}
+ 
+📰 News Article Content:
+{summaries}
+ 
+---
+ 
+📌 Return only the final bullet-point summary below:
+"""
+ 
+map_template = """
+You are an intelligent and unbiased AI summarizer.
+ 
+Extract the key facts relevant to the user query from the news article excerpts below.
+ 
+✅ Please ensure:
+• Return 3 to 6 short bullets, prefixed with "•"
+• Keep names, places, dates and figures exactly as written
+• NEVER invent information — rely strictly on what’s in the excerpts
+ 
+📝 User Query:
+{query}
+ 
+📰 News Article Excerpts:
+{summaries}
+ 
+📌 Return only the bullets:
+"""
+ 
+update_template = """
+You are an intelligent and unbiased AI summarizer keeping a running news summary up to date.
+ 
+✅ Please ensure:
+• Merge the new developments into the previous summary; drop points the new articles supersede
+• Use exactly 5 to 8 bullets, prefixed with "•", with no repitition
+• Put the most important new development first
+• NEVER invent information — rely strictly on the previous summary and the new article content
+ 
+📝 User Query:
+{query}
+ 
+📌 Previous Summary:
+{previous}
+ 
+📰 New Article Content:
+{summaries}
+ 
+📌 Return only the updated bullet-point summary below:
+"""
+ 
+# Clients are built on first use (langchain/newsapi imports are deferred with
+# them) and then shared process-wide
+_clients = {}
+_clients_lock = threading.RLock()
+ 
+def _client(name, factory):
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+ 
+def _build_llm(model_name=None):
+    from langchain_groq import ChatGroq
+    # The Groq SDK retries with exponential backoff itself; we supply the pooled client and timeouts
+    return ChatGroq(groq_api_key=groq_api_key, model_name=model_name or llm_model, temperature=0.3,
+                    timeout=llm_read_timeout, max_retries=llm_max_retries,
+                    http_client=build_httpx_client(http_pool_size, http_connect_timeout, llm_read_timeout))
+ 
+def _build_chain(template, input_variables=("query", "summaries"), llm=None):
+    from langchain.chains import LLMChain
+    from langchain.prompts import PromptTemplate
+    prompt = PromptTemplate(template=template, input_variables=list(input_variables))
+    return LLMChain(prompt=prompt, llm=llm or get_llm())
+ 
+def _build_newsapi():
+    from newsapi import NewsApiClient
+    session = build_http_session(http_pool_size, http_connect_timeout, news_read_timeout)
+    return NewsApiClient(api_key=news_api_key, session=session)
+ 
+def get_llm():
+    return _client("llm", _build_llm)
+ 
+def get_small_llm():
+    return _client("small_llm", lambda: _build_llm(llm_small_model))
+ 
+def get_llm_chain():
+    return _client("llm_chain", lambda: _build_chain(enhanced_template))
+ 
+def get_small_chain():
+    return _client("small_chain", lambda: _build_chain(enhanced_template, llm=get_small_llm()))
+ 
+def get_map_chain():
+    return _client("map_chain", lambda: _build_chain(map_template))
+ 
+def get_update_chain():
+    return _client("update_chain", lambda: _build_chain(update_template, ("query", "previous", "summaries")))
+ 
+def get_newsapi():
+    return _client("newsapi", _build_newsapi)
+ 
+def get_page_cache():
+    return _client("page_cache", lambda: PageCache(enrich_cache_dir, retry_after=enrich_retry_after))
+ 
+def set_clients(llm=None, newsapi=None, small_llm=None):
+    """Swaps in replacement clients (e.g. offline stand-ins); chains are rebuilt on next use.
+ 
+    A replacement ``llm`` also stands in for the small model unless ``small_llm`` is given.
+    """
+    with _clients_lock:
+        if llm is not None or small_llm is not None:
+            if llm is not None:
+                _clients["llm"] = llm
+            _clients["small_llm"] = small_llm or llm
+            for name in [name for name in _clients if name.endswith("_chain")]:
+                del _clients[name]
+        if newsapi is not None:
+            _clients["newsapi"] = newsapi
+ 
+# Process-wide summary cache shared by every Streamlit session
+summary_cache = SummaryCache(
+    max_entries=int(os.getenv("SUMMARY_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("SUMMARY_CACHE_TTL", "900")),
+    db_path=os.getenv("SUMMARY_CACHE_DB") or None,
+)
+# Identical in-flight queries share one NewsAPI fetch and one LLM call
+summary_flight = SingleFlight(max_workers=int(os.getenv("SUMMARY_WORKERS", "16")))
+# Batch-priority summaries start on their own BATCH_SUMMARY_WORKERS threads, so a
+# large batch never queues interactive requests behind it (identical queries still
+# coalesce with whatever call is already in flight)
+batch_summary_pool = ThreadPoolExecutor(max_workers=int(os.getenv("BATCH_SUMMARY_WORKERS", "8")),
+                                        thread_name_prefix="batch-summary")
+# Identical concurrent streams share one fetch and one LLM stream, replayed to each viewer
+summary_streams = StreamFlight(max_workers=int(os.getenv("SUMMARY_WORKERS", "16")))
+# MinHash Jaccard estimate above which syndicated copies are folded together
+dedup_threshold = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+# Prompt budget for the {summaries} slot; 0 disables sentence compression
+context_token_budget = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+# NewsAPI coverage per query; more than one page is fetched concurrently
+news_max_articles = int(os.getenv("NEWS_MAX_ARTICLES", "10"))
+news_page_size = int(os.getenv("NEWS_PAGE_SIZE", "10"))
+# Only the top-k most query-relevant articles reach the prompt; 0 keeps all
+relevance_top_k = int(os.getenv("RELEVANCE_TOP_K", "10"))
+relevance_index = RelevanceIndex()
+# "single" sends one prompt; "map_reduce" summarizes token-bounded chunks in
+# parallel and merges them; "auto" picks map_reduce when content exceeds the budget
+SUMMARY_MODES = ("single", "map_reduce", "auto")
+summary_mode = os.getenv("SUMMARY_MODE", "single")
+map_chunk_tokens = int(os.getenv("MAP_CHUNK_TOKENS", "1500"))
+map_concurrency = int(os.getenv("MAP_CONCURRENCY", "4"))
+# Degradation: after LLM_BREAKER_FAILURES consecutive LLM failures stop calling Groq
+# for LLM_BREAKER_RECOVERY seconds, then probe with a trial call. Meanwhile the
+# last good summary per query (kept for STALE_TTL seconds) is served marked stale,
+# and is also served when a fresh summary takes longer than STALE_DEADLINE seconds.
+llm_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+    recovery_timeout=float(os.getenv("LLM_BREAKER_RECOVERY", "30")),
+)
+# The small model fails on its own; its outages must not open the large model's circuit
+small_llm_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+    recovery_timeout=float(os.getenv("LLM_BREAKER_RECOVERY", "30")),
+)
+stale_deadline = float(os.getenv("STALE_DEADLINE", "8"))
+# Provider rate limits and quotas (0 = unlimited). Calls queue by priority
+# (interactive before batch) until the buckets admit them, and batch work
+# (pre-warming, batch runs) stops before the last NEWSAPI_INTERACTIVE_RESERVE
+# share of the daily quota.
+def _limit(name, share):
+    total = int(os.getenv(name, "0"))
+    return max(1, total // share) if total else 0
+ 
+def configure_limiters(share=1):
+    """(Re)builds the provider limiters with 1/``share`` of each configured limit.
+ 
+    Processes that share one API key (e.g. a batch worker pool) each take a
+    share, so together they stay within the provider's limits.
+    """
+    global newsapi_limiter, groq_limiter
+    newsapi_limiter = ProviderLimiter(
+        "newsapi",
+        requests_per_minute=_limit("NEWSAPI_RPM", share),
+        daily_quota=_limit("NEWSAPI_DAILY_QUOTA", share),
+        interactive_reserve=float(os.getenv("NEWSAPI_INTERACTIVE_RESERVE", "0.25")),
+    )
+    groq_limiter = ProviderLimiter(
+        "groq",
+        requests_per_minute=_limit("GROQ_RPM", share),
+        tokens_per_minute=_limit("GROQ_TPM", share),
+    )
+ 
+configure_limiters()
+# Completion budget added to the prompt estimate when reserving Groq tokens
+llm_expected_completion_tokens = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "400"))
+recent_summaries = SummaryCache(
+    max_entries=int(os.getenv("SUMMARY_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("STALE_TTL", "21600")),
+)
+# Near-identical spellings of a topic ("India-Pakistan Tensions", "india pakistan
+# tension latest") reuse a recent similar query's articles and summary for
+# QUERY_MATCH_TTL seconds, skipping NewsAPI and the LLM. QUERY_MATCH_THRESHOLD is
+# the cosine similarity required; callers opt out per request with fuzzy=False.
+fuzzy_query_match = os.getenv("FUZZY_QUERY_MATCH", "1") == "1"
+query_index = QueryIndex(threshold=float(os.getenv("QUERY_MATCH_THRESHOLD", "0.8")))
+query_results = SummaryCache(
+    max_entries=int(os.getenv("SUMMARY_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("QUERY_MATCH_TTL", "300")),
+)
+# Optional full-text enrichment of the articles that reach the prompt (NewsAPI
+# content is cut at ~200 chars), done only when the summary cache misses. Each
+# page gets ENRICH_BUDGET seconds, at most ENRICH_PER_HOST concurrent connections
+# per publisher; text is cached on disk, and pages that failed or had too little
+# text are not retried for ENRICH_RETRY_AFTER seconds.
+enrich_full_text = os.getenv("ENRICH_ARTICLES", "0") == "1"
+enrich_cache_dir = os.getenv("ENRICH_CACHE_DIR", ".article_cache")
+enrich_budget = float(os.getenv("ENRICH_BUDGET", "3"))
+enrich_per_host = int(os.getenv("ENRICH_PER_HOST", "2"))
+enrich_retry_after = float(os.getenv("ENRICH_RETRY_AFTER", "21600"))
+ 
+def _in_context(fn):
+    # Pool threads don't inherit context vars; carry the caller's (e.g. request priority)
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+ 
+def _scheduled_get_everything(**kwargs):
+    newsapi_limiter.acquire()
+    return get_newsapi().get_everything(**kwargs)
+ 
+def _get_everything(**kwargs):
+    return retry_call(_scheduled_get_everything, retries=news_retries, **kwargs)
+ 
+def _fetch_page(query, page, page_size, params):
+    kwargs = dict(q=query, language='en', sort_by='publishedAt', page_size=page_size, page=page, **params)
+    start = time.perf_counter()
+    try:
+        if news_hedge:
+            delay = metrics.REGISTRY.quantile("news_stage_duration_seconds", 0.95, min_samples=20,
+                                              stage="newsapi_fetch") or news_hedge_default_delay
+            result = hedged_call(_hedge_pool, delay, _in_context(_get_everything), **kwargs)
+        else:
+            result = _get_everything(**kwargs)
+        articles, error = [Article.from_newsapi(raw) for raw in result.get("articles", [])], None
+    except Exception as exc:
+        articles, error = [], exc
+        metrics.inc("news_stage_errors_total", stage="newsapi_fetch")
+    seconds = time.perf_counter() - start
+    metrics.observe("news_stage_duration_seconds", seconds, stage="newsapi_fetch")
+    return page, articles, seconds, error
+ 
+def iter_news_articles(query, max_articles=None, page_size=None, timings=None, **params):
+    """Yields URL-unique articles as each page arrives; pages are fetched concurrently.
+ 
+    Pass a list as ``timings`` to receive one ``{"page", "seconds", "articles", "error"}``
+    dict per page. A failing first page raises; later pages are best-effort.
+    """
+    max_articles = max_articles or news_max_articles
+    page_size = max(1, min(page_size or news_page_size, max_articles, 100))
+    pages = math.ceil(max_articles / page_size)
+    pool = ThreadPoolExecutor(max_workers=min(pages, 8), thread_name_prefix="newsapi")
+    fetch_page = _in_context(_fetch_page)
+    futures = [pool.submit(fetch_page, query, page, page_size, params) for page in range(1, pages + 1)]
+    seen, yielded = set(), 0
+    try:
+        for future in as_completed(futures):
+            page, batch, seconds, error = future.result()
+            if timings is not None:
+                timings.append({"page": page, "seconds": seconds, "articles": len(batch), "error": error})
+            if error is not None:
+                if page == 1:
+                    raise error
+                continue
+            for article in batch:
+                url = article.url
+                if url:
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                yield article
+                yielded += 1
+                if yielded >= max_articles:
+                    return
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+ 
+_NO_DATE = datetime.min.replace(tzinfo=timezone.utc)
+ 
+def _newest_first(articles):
+    return sorted(articles, key=lambda a: a.published_at or _NO_DATE, reverse=True)
+ 
+def get_news_articles(query, **kwargs):
+    return _newest_first(iter_news_articles(query, **kwargs))
+ 
+def summarize_articles(articles):
+    return ' '.join(article.description or article.content for article in articles)
+   
+NO_CONTENT_MESSAGE = "⚠️ No content found to summarize. Try another topic."
+ 
+def build_prompt_context(query, articles, token_budget=None, top_k=None):
+    """Dedupes, ranks and packs articles for the prompt; returns ``(used_articles, summaries)``."""
+    # When ``articles`` is a live page iterator this span also covers waiting on later pages
+    with metrics.timed("context_build"):
+        unique_articles = _newest_first(dedupe_articles(articles, threshold=dedup_threshold))
+        unique_articles = relevance_index.top_k(query, unique_articles, relevance_top_k if top_k is None else top_k)
+        summaries, stats = build_context(
+            query, unique_articles, token_budget=context_token_budget if token_budget is None else token_budget
+        )
+    metrics.inc("context_tokens_saved_total", stats["tokens_saved"])
+    if stats["tokens_saved"]:
+        logger.info("Context for %r: %d -> %d tokens (%d saved)", query,
+                    stats["tokens_in"], stats["tokens_out"], stats["tokens_saved"])
+    used_articles = [a for a in unique_articles if a.text]
+    return used_articles, summaries
+ 
+def _enrich_context(query, used_articles, summaries, token_budget=None):
+    """With enrichment on, fetches the full text of ``used_articles`` and rebuilds the context from it.
+ 
+    Called only after the summary cache missed, so cache hits never wait on publishers.
+    """
+    if not enrich_full_text:
+        return used_articles, summaries
+    used_articles = enrich_articles(used_articles, cache=get_page_cache(), per_host=enrich_per_host,
+                                    max_connections=http_pool_size, budget=enrich_budget,
+                                    connect_timeout=http_connect_timeout)
+    with metrics.timed("context_build"):
+        summaries, _ = build_context(
+            query, used_articles, token_budget=context_token_budget if token_budget is None else token_budget
+        )
+    return used_articles, summaries
+ 
+def _prepare_context(query, token_budget=None, top_k=None):
+    articles = []
+ 
+    def _arrivals():
+        # Dedup signatures are computed while later pages are still in flight
+        for article in iter_news_articles(query):
+            articles.append(article)
+            yield article
+ 
+    used_articles, summaries = build_prompt_context(query, _arrivals(), token_budget=token_budget, top_k=top_k)
+    return _newest_first(articles), used_articles, summaries
+ 
+def _cache_get(cache_key, cache_name="summary"):
+    value = summary_cache.get(cache_key)
+    metrics.inc("summary_cache_requests_total", cache=cache_name, result="miss" if value is None else "hit")
+    return value
+ 
+def _run_chain(chain, template, query, summaries, breaker=None, **inputs):
+    prompt_tokens = count_tokens(template.format(query=query, summaries=summaries, **inputs))
+    metrics.inc("llm_prompt_tokens_total", prompt_tokens)
+    groq_limiter.acquire(tokens=prompt_tokens + llm_expected_completion_tokens)
+    with metrics.timed("llm_run"):
+        output = (breaker or llm_breaker).call(chain.run, query=query, summaries=summaries, **inputs)
+    metrics.inc("llm_completion_tokens_total", count_tokens(output))
+    return output
+ 
+def _summarize(query, summaries, article_count):
+    """Runs the summary prompt through the model cascade and returns the output."""
+    if llm_cascade:
+        prompt_tokens = count_tokens(enhanced_template.format(query=query, summaries=summaries))
+        if choose_model(prompt_tokens, article_count, small_model_max_prompt_tokens,
+                        small_model_max_articles) == SMALL:
+            try:
+                output = _run_chain(get_small_chain(), enhanced_template, query, summaries, breaker=small_llm_breaker)
+                problems = validation_problems(output, summaries)
+            except Exception as exc:
+                logger.warning("Small model failed for %r: %s", query, exc)
+                problems = ["error"]
+            if not problems:
+                metrics.inc("llm_route_total", model=SMALL)
+                return output
+            metrics.inc("llm_escalations_total", reason=problems[0])
+            logger.info("Escalating %r to the large model: %s", query, ", ".join(problems))
+    metrics.inc("llm_route_total", model=LARGE)
+    return _run_chain(get_llm_chain(), enhanced_template, query, summaries)
+ 
+def _chunk_articles(articles, chunk_tokens):
+    chunks, current, used = [], [], 0
+    for article in articles:
+        text = article.text
+        tokens = count_tokens(text)
+        if current and used + tokens > chunk_tokens:
+            chunks.append(' '.join(current))
+            current, used = [], 0
+        current.append(text)
+        used += tokens
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+ 
+def _map_chunk(query, chunk):
+    # Chunk summaries are cached on their own so overlapping article sets reuse them
+    digest = hashlib.sha256(f"{normalize_query(query)}\x00{chunk}".encode('utf-8')).hexdigest()
+    cache_key = f"map|{digest}"
+    cached = _cache_get(cache_key, cache_name="map")
+    if cached is not None:
+        return cached
+    partial = _run_chain(get_map_chain(), map_template, query, chunk)
+    summary_cache.set(cache_key, partial)
+    return partial
+ 
+def _map_reduce(query, used_articles, concurrency=None):
+    chunks = _chunk_articles(used_articles, map_chunk_tokens)
+    if len(chunks) == 1:
+        return _summarize(query, chunks[0], len(used_articles))
+    with ThreadPoolExecutor(max_workers=min(concurrency or map_concurrency, len(chunks))) as pool:
+        map_chunk = _in_context(_map_chunk)
+        partials = list(pool.map(lambda chunk: map_chunk(query, chunk), chunks))
+    return _run_chain(get_llm_chain(), enhanced_template, query, "\n".join(partials))
+ 
+def _compute_summary(query, mode="single"):
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode {mode!r}; expected one of {SUMMARY_MODES}")
+    resolved = mode
+    if mode == "single":
+        articles, used_articles, summaries = _prepare_context(query)
+    else:
+        # Map-reduce covers every fetched article, so skip top-k and the prompt budget
+        articles, used_articles, summaries = _prepare_context(query, token_budget=0, top_k=0)
+        if mode == "auto":
+            resolved = "map_reduce" if count_tokens(summaries) > context_token_budget else "single"
+    # Auto picks from the teasers; a single prompt rebuilt from enriched full text still needs the budget
+    token_budget = 0 if resolved == "map_reduce" else None
+ 
+    if not summaries.strip():
+        return NO_CONTENT_MESSAGE, []
+ 
+    cache_key = make_cache_key(query, articles, variant=None if resolved == "single" else resolved)
+    summary_output = _cache_get(cache_key)
+    if summary_output is None:
+        used_articles, summaries = _enrich_context(query, used_articles, summaries, token_budget)
+        if resolved == "map_reduce":
+            summary_output = _map_reduce(query, used_articles)
+        else:
+            summary_output = _summarize(query, summaries, len(used_articles))
+        summary_cache.set(cache_key, summary_output)
+ 
+    # Keyed by the mode the caller asked for, so a later "auto" lookup finds it
+    _remember_result(query, mode, summary_output, used_articles)
+    return summary_output, used_articles
+ 
+def summarize_delta(query, new_articles, previous_summary=None):
+    """Summarizes ``new_articles``; with a previous summary, returns it updated with the delta.
+ 
+    Returns ``(summary, used_articles)``, or ``(previous_summary, [])`` when the
+    new articles carry no usable content.
+    """
+    used_articles, summaries = build_prompt_context(query, new_articles)
+    if not summaries.strip():
+        return previous_summary, []
+    used_articles, summaries = _enrich_context(query, used_articles, summaries)
+    if previous_summary:
+        return _run_chain(get_update_chain(), update_template, query, summaries, previous=previous_summary), used_articles
+    return _summarize(query, summaries, len(used_articles)), used_articles
+ 
+def _remember_result(query, mode, summary, articles):
+    # Every finished summary (computed, streamed or served from the cache) feeds the
+    # stale fallback and the similar-query index
+    created = time.time()
+    recent_summaries.set(_flight_key(query, mode), {"summary": summary, "articles": articles, "created": created})
+    key = query_index.add(query)
+    if key:
+        query_results.set(f"{key}|{mode}", {"query": query, "summary": summary, "articles": articles,
+                                            "created": created})
+ 
+def hold_result(query, ttl, mode=None):
+    """Keeps the similar-query entry for ``query`` for ``ttl`` seconds instead of QUERY_MATCH_TTL.
+
+    Pre-warming uses it so a warmed topic is reusable until the next refresh,
+    without changing how long anything else is reused.
+    """
+    key = query_index.add(query)
+    entry_key = f"{key}|{mode or summary_mode}"
+    entry = query_results.get(entry_key) if key else None
+    if entry is not None:
+        query_results.set(entry_key, entry, ttl=ttl)
+ 
+def _similar_result(query, mode):
+    key, _ = query_index.match(query)
+    entry = query_results.get(f"{key}|{mode}") if key else None
+    metrics.inc("summary_cache_requests_total", cache="query", result="miss" if entry is None else "hit")
+    return entry
+ 
+def _flight_key(query, mode):
+    return normalize_query(query) if mode == "single" else f"{normalize_query(query)}|{mode}"
+ 
+def _stale_result(entry):
+    metrics.inc("stale_summaries_served_total")
+    return {"summary": entry["summary"], "articles": entry["articles"], "stale": True,
+            "age_seconds": time.time() - entry["created"], "matched_query": None}
+ 
+# Recent interactive queries, used to pick hot topics for pre-warming
+_recent_queries = deque(maxlen=int(os.getenv("RECENT_QUERY_WINDOW", "1000")))
+ 
+def record_query(query):
+    if current_priority() == INTERACTIVE:
+        _recent_queries.append((time.time(), query))
+ 
+def frequent_queries(n=5, within=3600):
+    """Most frequent recent interactive queries (by normalized form), most popular first."""
+    cutoff = time.time() - within
+    counts, spelling = Counter(), {}
+    for created, query in list(_recent_queries):
+        if created >= cutoff:
+            key = normalize_query(query)
+            counts[key] += 1
+            spelling[key] = query
+    return [spelling[key] for key, _ in counts.most_common(n)]
+ 
+def get_summary_with_status(query, timeout=None, mode=None, fuzzy=None):
+    """Like get_summary, but returns a dict that also says whether the summary is stale.
+ 
+    When the LLM circuit is open, or a fresh summary is slower than
+    ``stale_deadline`` or fails, the last good summary for the query is returned
+    with ``stale=True`` while the refresh carries on in the background. A result
+    reused from a similar recent query names it in ``matched_query``.
+    """
+    record_query(query)
+    mode = mode or summary_mode
+    if fuzzy_query_match if fuzzy is None else fuzzy:
+        entry = _similar_result(query, mode)
+        if entry is not None:
+            return {"summary": entry["summary"], "articles": entry["articles"], "stale": False,
+                    "age_seconds": time.time() - entry["created"], "matched_query": entry["query"]}
+    flight_key = _flight_key(query, mode)
+    future = summary_flight.submit(flight_key, _compute_summary, query, mode,
+                                   executor=batch_summary_pool if current_priority() == BATCH else None)
+    stale = recent_summaries.get(flight_key)
+    if stale is not None and llm_breaker.state != "closed" and not future.done():
+        return _stale_result(stale)
+    try:
+        wait = timeout if stale is None else min(stale_deadline, timeout or stale_deadline)
+        summary, articles = future.result(timeout=wait)
+    except Exception:
+        # Timeouts land here too; the shared call keeps running and refreshes the caches
+        if stale is None:
+            raise
+        return _stale_result(stale)
+    return {"summary": summary, "articles": articles, "stale": False, "age_seconds": 0.0, "matched_query": None}
+ 
+def get_summary(query, timeout=None, mode=None, fuzzy=None):
+    result = get_summary_with_status(query, timeout=timeout, mode=mode, fuzzy=fuzzy)
+    return result["summary"], result["articles"]
+ 
+def llm_available():
+    return llm_breaker.state == "closed"
+ 
+async def _summary_result(query, semaphore, timeout, mode, level):
+    async with semaphore:
+        try:
+            loop = asyncio.get_running_loop()
+            started = asyncio.Event()
+            with priority(level):
+                future = summary_flight.submit(
+                    _flight_key(query, mode), _compute_summary, query, mode,
+                    executor=batch_summary_pool if level == BATCH else None,
+                    on_start=lambda: loop.call_soon_threadsafe(started.set),
+                )
+            # The timeout covers the work, not time queued for a pool thread
+            await started.wait()
+            # shield: a timed-out batch entry must not cancel a call other sessions share
+            summary, articles = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            return {"query": query, "summary": summary, "articles": articles, "error": None}
+        except asyncio.TimeoutError:
+            return {"query": query, "summary": None, "articles": [], "error": f"Timed out after {timeout}s"}
+        except Exception as exc:
+            return {"query": query, "summary": None, "articles": [], "error": f"{type(exc).__name__}: {exc}"}
+ 
+async def aget_summaries(queries, concurrency=8, timeout=60, mode=None, level=BATCH):
+    """Summarizes many queries concurrently; results keep input order with a per-query error.
+ 
+    Provider calls are scheduled at ``level`` (batch by default), behind interactive traffic.
+    Batch-level summaries run on ``batch_summary_pool``, so at most BATCH_SUMMARY_WORKERS
+    (default 8) run at once whatever ``concurrency`` asks for, and interactive requests
+    keep the ``summary_flight`` pool to themselves. ``timeout`` counts from when a
+    query's work starts, not while it waits for a pool thread.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    mode = mode or summary_mode
+    return await asyncio.gather(*(_summary_result(q, semaphore, timeout, mode, level) for q in queries))
+ 
+def get_summaries(queries, concurrency=8, timeout=60, mode=None, level=BATCH):
+    return asyncio.run(aget_summaries(queries, concurrency=concurrency, timeout=timeout, mode=mode, level=level))
+ 
+def _stream_llm(query, summaries, cache_key, used_articles):
+    if not llm_breaker.allow():
+        raise CircuitOpenError("LLM circuit open; skipping call")
+    prompt_text = enhanced_template.format(query=query, summaries=summaries)
+    prompt_tokens = count_tokens(prompt_text)
+    metrics.inc("llm_prompt_tokens_total", prompt_tokens)
+    parts = []
+    # Every exit must settle the breaker, or a half-open trial stays taken forever
+    try:
+        groq_limiter.acquire(tokens=prompt_tokens + llm_expected_completion_tokens)
+        with metrics.timed("llm_stream"):
+            for chunk in get_llm().stream(prompt_text):
+                text = getattr(chunk, 'content', chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+    except GeneratorExit:
+        # Abandoned by the consumer (disconnect, rerun) while tokens were flowing: the LLM is healthy
+        llm_breaker.record_success()
+        raise
+    except BaseException:
+        llm_breaker.record_failure()
+        raise
+    llm_breaker.record_success()
+    output = ''.join(parts)
+    metrics.inc("llm_completion_tokens_total", count_tokens(output))
+    # Only a fully consumed stream is cached
+    summary_cache.set(cache_key, output)
+    _remember_result(query, "single", output, used_articles)
+ 
+def _open_stream(query):
+    articles, used_articles, summaries = _prepare_context(query)
+ 
+    if not summaries.strip():
+        return iter([NO_CONTENT_MESSAGE]), []
+ 
+    cache_key = make_cache_key(query, articles)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        _remember_result(query, "single", cached, used_articles)
+        return iter([cached]), used_articles
+ 
+    used_articles, summaries = _enrich_context(query, used_articles, summaries)
+    return _stream_llm(query, summaries, cache_key, used_articles), used_articles
+ 
+def stream_summary(query, fuzzy=None):
+    """Returns (chunk iterator, used_articles); articles are fetched before the first token.
+ 
+    Concurrent streams of the same query share one fetch and one LLM stream.
+    While the LLM circuit is not closed this falls back to get_summary_with_status,
+    which serves the last good summary marked stale.
+    """
+    record_query(query)
+    if fuzzy_query_match if fuzzy is None else fuzzy:
+        entry = _similar_result(query, "single")
+        if entry is not None:
+            return iter([entry["summary"]]), entry["articles"]
+    if not llm_available():
+        result = get_summary_with_status(query, mode="single", fuzzy=False)
+        return iter([result["summary"]]), result["articles"]
+    return summary_streams.subscribe(_flight_key(query, "single"), _open_stream, query)
+ 
+def stream_bullets(chunks):
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split("•")
+        for bullet in complete:
+            if bullet.strip():
+                yield f"• {bullet.strip()}"
+    if buffer.strip():
+        yield f"• {buffer.strip()}"
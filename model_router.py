@@ -0,0 +1,41 @@
+from context_builder import content_terms, words
+
+SMALL = "small"
+LARGE = "large"
+
+
+def choose_model(prompt_tokens, article_count, max_prompt_tokens=800, max_articles=4):
+    """Light requests (short prompt, few articles) go to the small model."""
+    if prompt_tokens <= max_prompt_tokens and article_count <= max_articles:
+        return SMALL
+    return LARGE
+
+
+def _bullets(output):
+    # Anything before the first marker is preamble, not a bullet
+    return [b.strip() for b in (output or "").split("•")[1:] if b.strip()]
+
+
+def _support(bullet, source_terms):
+    terms = [w for w in content_terms(bullet) if len(w) > 3 or w.isdigit()]
+    if not terms:
+        return 1.0
+    return sum(t in source_terms for t in terms) / len(terms)
+
+
+def validation_problems(output, source, min_bullets=5, max_bullets=8, min_support=0.5):
+    """Reasons ``output`` is not an acceptable summary of ``source``; empty when it is.
+
+    Checks for empty output, a bullet count outside ``min_bullets..max_bullets``
+    and bullets whose content words are mostly absent from the source.
+    """
+    if not (output or "").strip():
+        return ["empty"]
+    bullets = _bullets(output)
+    problems = []
+    if not min_bullets <= len(bullets) <= max_bullets:
+        problems.append("bullet_count")
+    source_terms = set(words(source))
+    if any(_support(b, source_terms) < min_support for b in bullets):
+        problems.append("ungrounded")
+    return problems
@@ -1,632 +1,763 @@
-# ✅ Enhanced News Research Dashboard with Modern UI
-
-import streamlit as st
-import pandas as pd
-from langchain_config import get_summary
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from datetime import datetime
-
-# ⚙️ Setting up the app layout and title
-st.set_page_config(
-    page_title="AI News Research Dashboard", 
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# 🎨 Custom CSS for modern dashboard styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    .main > div {
-        padding-top: 2rem;
-    }
-    
-    html, body, [class*="css"] {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Header Gradient */
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-    }
-    
-    .main-header h1 {
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    .main-header p {
-        font-size: 1.2rem;
-        font-weight: 300;
-        opacity: 0.9;
-    }
-    
-    /* Login Container */
-    .login-container {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        padding: 3rem;
-        border-radius: 20px;
-        max-width: 450px;
-        margin: 2rem auto;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-        color: white;
-    }
-    
-    .login-container h3 {
-        text-align: center;
-        font-size: 2rem;
-        margin-bottom: 1rem;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-    }
-    
-    /* Card Styles */
-    .info-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    
-    .success-card {
-        background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        text-align: center;
-        margin: 1rem 0;
-        border: 1px solid #e0e0e0;
-    }
-    
-    .summary-card {
-        background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-    }
-    
-    .article-card {
-        background: white;
-        padding: 1.2rem;
-        border-radius: 10px;
-        margin: 0.8rem 0;
-        box-shadow: 0 3px 10px rgba(0,0,0,0.1);
-        border-left: 3px solid #4CAF50;
-        transition: transform 0.2s ease;
-    }
-    
-    .article-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 5px 20px rgba(0,0,0,0.15);
-    }
-    
-    .history-card {
-        background: linear-gradient(135deg, #e3ffe7 0%, #d9e7ff 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border: 1px solid #e0e0e0;
-    }
-    
-    /* Button Styles */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 8px;
-        padding: 0.6rem 1.2rem;
-        font-weight: 500;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6);
-    }
-    
-    /* Example Button Styles */
-    .example-btn {
-        background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%);
-        border: none;
-        border-radius: 20px;
-        padding: 0.5rem 1rem;
-        color: #333;
-        font-weight: 500;
-        margin: 0.2rem;
-        transition: all 0.3s ease;
-        cursor: pointer;
-    }
-    
-    .example-btn:hover {
-        transform: scale(1.05);
-        box-shadow: 0 5px 15px rgba(255, 154, 158, 0.4);
-    }
-    
-    /* Text Area Styles */
-    .stTextArea textarea {
-        border-radius: 10px;
-        border: 2px solid #e0e0e0;
-        font-family: 'Inter', sans-serif;
-        transition: border-color 0.3s ease;
-    }
-    
-    .stTextArea textarea:focus {
-        border-color: #667eea;
-        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-    }
-    
-    /* Sidebar Styles */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-    
-    /* Stats Cards */
-    .stats-container {
-        display: flex;
-        gap: 1rem;
-        margin: 1rem 0;
-    }
-    
-    .stat-card {
-        flex: 1;
-        background: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-        border-top: 4px solid;
-    }
-    
-    .stat-card.queries {
-        border-top-color: #4CAF50;
-    }
-    
-    .stat-card.summaries {
-        border-top-color: #2196F3;
-    }
-    
-    .stat-card.articles {
-        border-top-color: #FF9800;
-    }
-    
-    .stat-number {
-        font-size: 2rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-    }
-    
-    .stat-label {
-        color: #666;
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    /* Download Button Special Styling */
-    .download-btn {
-        background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-    }
-    
-    /* Animation for loading */
-    @keyframes pulse {
-        0% { opacity: 1; }
-        50% { opacity: 0.5; }
-        100% { opacity: 1; }
-    }
-    
-    .loading {
-        animation: pulse 1.5s ease-in-out infinite;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 📊 Initialize session state for stats
-if 'total_queries' not in st.session_state:
-    st.session_state.total_queries = 0
-if 'total_summaries' not in st.session_state:
-    st.session_state.total_summaries = 0
-if 'total_articles' not in st.session_state:
-    st.session_state.total_articles = 0
-
-# 📌 Enhanced User Authentication with modern UI
-def handle_authentication():
-    if 'authenticated' not in st.session_state:
-        st.session_state.authenticated = False
-
-    if not st.session_state.authenticated:
-        st.markdown("""
-            <div class='login-container'>
-                <h3>🔐 Welcome Back!</h3>
-                <p style='text-align: center; margin-bottom: 2rem; opacity: 0.9;'>
-                    Please login to access the AI News Research Dashboard
-                </p>
-                <div style='background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem;'>
-                    <p style='margin: 0; font-size: 0.9rem;'>
-                        <strong>Demo Credentials:</strong><br>
-                        Username: <code>Sukriti</code><br>
-                        Password: <code>Sukriti123</code>
-                    </p>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
-
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            username = st.text_input("👤 Username", placeholder="Enter username", key="username")
-            password = st.text_input("🔑 Password", type="password", placeholder="Enter password", key="password")
-            
-            if st.button("🚀 Login", use_container_width=True):
-                if username == "Sukriti" and password == "Sukriti123":
-                    st.session_state.authenticated = True
-                    st.success("✅ Login successful! Redirecting...")
-                    st.rerun()
-                else:
-                    st.error("❌ Invalid credentials. Please try again.")
-        st.stop()
-
-# 📈 Dashboard Stats Display
-def show_dashboard_stats():
-    st.markdown("""
-        <div class='stats-container'>
-            <div class='stat-card queries'>
-                <div class='stat-number' style='color: #4CAF50;'>{}</div>
-                <div class='stat-label'>Total Queries</div>
-            </div>
-            <div class='stat-card summaries'>
-                <div class='stat-number' style='color: #2196F3;'>{}</div>
-                <div class='stat-label'>Summaries Generated</div>
-            </div>
-            <div class='stat-card articles'>
-                <div class='stat-number' style='color: #FF9800;'>{}</div>
-                <div class='stat-label'>Articles Processed</div>
-            </div>
-        </div>
-    """.format(
-        st.session_state.total_queries,
-        st.session_state.total_summaries,
-        st.session_state.total_articles
-    ), unsafe_allow_html=True)
-
-# 📚 Enhanced History Display
-def show_history():
-    if 'history' in st.session_state and st.session_state.history:
-        st.markdown("""
-            <div style='margin-top: 2rem;'>
-                <h3 style='text-align:center; color: #667eea; margin-bottom: 1rem;'>
-                    📚 Recent Query History
-                </h3>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        for idx, (query, response) in enumerate(reversed(st.session_state.history[-5:]), 1):
-            st.markdown(f"""
-                <div class='history-card'>
-                    <h4 style='color: #333; margin-bottom: 0.5rem;'>
-                        🔍 Query {idx}: {query}
-                    </h4>
-                    <p style='color: #666; font-size: 0.9rem; margin: 0;'>
-                        {response[:150]}{'...' if len(response) > 150 else ''}
-                    </p>
-                    <small style='color: #999;'>
-                        📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}
-                    </small>
-                </div>
-            """, unsafe_allow_html=True)
-
-# ♻️ Enhanced Reset Function
-def reset_all():
-    preserved_keys = {'authenticated', 'total_queries', 'total_summaries', 'total_articles'}
-    for key in list(st.session_state.keys()):
-        if key not in preserved_keys:
-            del st.session_state[key]
-    st.session_state.query_input = ""
-    st.success("🔄 Dashboard reset successfully!")
-    st.rerun()
-
-# 📄 Enhanced PDF Generation
-def create_pdf(text_data):
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    
-    # Add header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(72, height - 72, "AI News Research Summary")
-    c.setFont("Helvetica", 10)
-    c.drawString(72, height - 90, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Add content
-    textobject = c.beginText()
-    textobject.setTextOrigin(72, height - 120)
-    textobject.setFont("Helvetica", 11)
-    
-    wrap_width = 85
-    for line in text_data.split("\n"):
-        while len(line) > wrap_width:
-            space_pos = line.rfind(' ', 0, wrap_width)
-            if space_pos == -1:
-                space_pos = wrap_width
-            textobject.textLine(line[:space_pos])
-            line = line[space_pos:].strip()
-        textobject.textLine(line.strip())
-    
-    c.drawText(textobject)
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
-
-# 🧠 Enhanced Main Summary Generation Function
-def generate_summary_and_output():
-    # Main Header
-    st.markdown("""
-        <div class='main-header'>
-            <h1>🤖 AI News Research Dashboard</h1>
-            <p>Intelligent news analysis powered by advanced AI technology</p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    # Dashboard Stats
-    show_dashboard_stats()
-    
-    # Example Queries Section
-    st.markdown("""
-        <div class='info-card'>
-            <h4 style='color: #667eea; margin-bottom: 1rem;'>🎯 Quick Start Examples</h4>
-            <p style='margin-bottom: 1rem; color: #666;'>
-                Click any example below to auto-fill your query and get started instantly!
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    examples = [
-        "Explosive growth in AI technologies like AI video generators and agents",
-        " India-Pakistan Tensions",
-        " Israel-Iran Conflict Updates",
-        " IPL 2025 Match Highlights"
-    ]
-    
-    example_cols = st.columns(len(examples))
-    for i, example in enumerate(examples):
-        with example_cols[i]:
-            if st.button(example, use_container_width=True, key=f"example_{i}"):
-                st.session_state.query_input = example.split(" ", 1)[1]  # Remove emoji
-
-    # Query Input Section
-    st.markdown("""
-        <div style='margin-top: 2rem;'>
-            <h4 style='text-align:center; color: #667eea; margin-bottom: 1rem;'>
-                🔍 Enter Your Research Query
-            </h4>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    query = st.text_area(
-        "", 
-        key="query_input", 
-        height=100, 
-        label_visibility="collapsed",
-        placeholder="Type your news research query here... (e.g., 'Latest developments in AI technology')"
-    )
-
-    # Action Buttons
-    col1, col2, col3 = st.columns([2, 1, 1])
-    with col1:
-        gen_btn = st.button("⚡ Generate AI Summary", use_container_width=True)
-    with col2:
-        reset_btn = st.button("🔄 Reset Dashboard", use_container_width=True)
-    with col3:
-        if st.button("📊 Refresh Stats", use_container_width=True):
-            st.rerun()
-
-    if reset_btn:
-        reset_all()
-
-    if gen_btn:
-        if query:
-            # Update query counter
-            st.session_state.total_queries += 1
-            
-            # Show loading animation
-            with st.spinner('🔄 AI is analyzing news articles...'):
-                response, articles = get_summary(query)
-                
-            # Process response
-            bullet_lines = [f"• {line.strip()}" for line in response.split("•") if line.strip()]
-            header_line = articles[0].get("title", "Top News") if articles else (bullet_lines[0][1:].strip() if bullet_lines else "AI News Summary")
-            formatted_summary = "\n".join(bullet_lines[1:]) if len(bullet_lines) > 1 else response
-            
-            # Update summary counter
-            st.session_state.total_summaries += 1
-            st.session_state.total_articles += len(articles) if articles else 0
-
-            # Display Header
-            st.markdown(f"""
-                <div class='summary-card'>
-                    <h3 style='margin: 0; color: #333; text-align: center;'>
-                        📰 {header_line}
-                    </h3>
-                </div>
-            """, unsafe_allow_html=True)
-
-            # Display AI Summary
-            st.markdown("""
-                <div class='info-card'>
-                    <h3 style='color: #667eea; margin-bottom: 1rem; text-align: center;'>
-                        🧠 AI-Generated News Summary
-                    </h3>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-                <div style='background: linear-gradient(135deg, #e3f2fd 0%, #f3e5f5 100%); 
-                            padding: 1.5rem; border-radius: 12px; border-left: 4px solid #2196F3;'>
-                    <ul style='padding-left: 1.5rem; margin: 0; line-height: 1.8;'>
-                        {''.join([f'<li style="margin-bottom: 0.8rem; color: #333;">{line[1:].strip()}</li>' 
-                                for line in formatted_summary.splitlines() if line.strip() and line.startswith('•')])}
-                    </ul>
-                </div>
-            """, unsafe_allow_html=True)
-
-            # Display Articles
-            articles_text = ""
-            if articles:
-                st.markdown("""
-                    <div style='margin-top: 2rem;'>
-                        <h3 style='color: #667eea; margin-bottom: 1rem; text-align: center;'>
-                            📰 Source Articles Analyzed
-                        </h3>
-                    </div>
-                """, unsafe_allow_html=True)
-                
-                top_articles = articles[:3]
-                for i, article in enumerate(top_articles, 1):
-                    title = article.get("title", "No title available")
-                    source = article.get("source", {}).get("name", "Unknown Source")
-                    date = article.get("publishedAt", "").split("T")[0] if article.get("publishedAt") else "Unknown Date"
-                    url = article.get("url", "#")
-                    
-                    st.markdown(f"""
-                        <div class='article-card'>
-                            <h4 style='color: #333; margin-bottom: 0.8rem;'>
-                                📄 Article {i}: {title}
-                            </h4>
-                            <div style='display: flex; justify-content: space-between; align-items: center; 
-                                       flex-wrap: wrap; gap: 1rem;'>
-                                <div>
-                                    <span style='background: #e8f5e8; padding: 0.3rem 0.8rem; 
-                                               border-radius: 15px; font-size: 0.8rem; color: #2e7d32;'>
-                                        📅 {date}
-                                    </span>
-                                    <span style='background: #e3f2fd; padding: 0.3rem 0.8rem; 
-                                               border-radius: 15px; font-size: 0.8rem; color: #1976d2; margin-left: 0.5rem;'>
-                                        🏷️ {source}
-                                    </span>
-                                </div>
-                                <a href='{url}' target='_blank' style='text-decoration: none; 
-                                   background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                                   color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.8rem;'>
-                                    🔗 Read Full Article
-                                </a>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    articles_text += f"Article {i}: {title}\nDate: {date} | Source: {source}\nURL: {url}\n\n"
-
-                # Success message
-                st.markdown(f"""
-                    <div class='success-card'>
-                        <span style='color: #2e7d32; font-weight: 600;'>
-                            ✅ Successfully analyzed {len(top_articles)} articles and generated comprehensive summary!
-                        </span>
-                    </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.warning("⚠️ No articles found for this query. Please try a different search term.")
-
-            # Save to history
-            if 'history' not in st.session_state:
-                st.session_state.history = []
-            st.session_state.history.append((query, formatted_summary))
-
-            # Prepare download content
-            combined_output = f"""AI News Research Summary
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-Query: {query}
-
-Top News Header: {header_line}
-
-🧠 AI-Generated News Summary:
-{formatted_summary.strip()}
-
-📰 Source Articles Analyzed:
-{articles_text.strip()}
-
----
-Generated by AI News Research Dashboard
-"""
-
-            # Download Buttons
-            st.markdown("<div style='margin-top: 2rem;'></div>", unsafe_allow_html=True)
-            col_download1, col_download2 = st.columns(2)
-            
-            with col_download1:
-                st.download_button(
-                    "📥 Download as TXT", 
-                    data=combined_output, 
-                    file_name=f"news_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt", 
-                    mime="text/plain", 
-                    use_container_width=True
-                )
-
-            pdf_output = create_pdf(combined_output)
-            with col_download2:
-                st.download_button(
-                    "📄 Download as PDF", 
-                    data=pdf_output, 
-                    file_name=f"news_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf", 
-                    mime="application/pdf", 
-                    use_container_width=True
-                )
-        else:
-            st.error("⚠️ Please enter a research query to generate summary.")
-
-# 🏃‍♂️ Sidebar Navigation
-def show_sidebar():
-    with st.sidebar:
-        st.markdown("""
-            <div style='text-align: center; padding: 1rem; color: white;'>
-                <h2>🎛️ Dashboard</h2>
-                <p>Control Panel</p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # User info
-        st.markdown("""
-            <div style='background: rgba(255,255,255,0.1); padding: 1rem; 
-                       border-radius: 10px; color: white; text-align: center; margin-bottom: 1rem;'>
-                <h4>👤 Welcome, Sukriti!</h4>
-                <p style='margin: 0; opacity: 0.8;'>Premium User</p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Quick stats
-        st.metric("🔍 Queries Today", st.session_state.total_queries)
-        st.metric("📄 Summaries", st.session_state.total_summaries)
-        st.metric("📰 Articles Analyzed", st.session_state.total_articles)
-        
-        st.markdown("---")
-        
-        if st.button("🚪 Logout", use_container_width=True):
-            st.session_state.authenticated = False
-            st.rerun()
-
-# 🚀 Main App Execution
-def main():
-    handle_authentication()
-    show_sidebar()
-    generate_summary_and_output()
-    show_history()
-
-if __name__ == "__main__":
+# ✅ Enhanced News Research Dashboard with Modern UI
+
+import os
+import streamlit as st
+import metrics
+from history_store import HistoryStore
+from prewarm import Prewarmer
+from langchain_config import get_summary_with_status, llm_available, stream_summary
+from reports import article_fields, build_report, create_pdf, format_articles_text, split_summary
+from datetime import datetime
+
+# ⚙️ Setting up the app layout and title
+st.set_page_config(
+    page_title="AI News Research Dashboard", 
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# 📡 Prometheus-style /metrics endpoint, started once per process
+if os.getenv("METRICS_PORT"):
+    metrics.start_http_server(int(os.getenv("METRICS_PORT")))
+
+# 🎨 Custom CSS for modern dashboard styling
+st.markdown("""
+<style>
+    /* Import Google Fonts */
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
+    
+    /* Global Styles */
+    .main > div {
+        padding-top: 2rem;
+    }
+    
+    html, body, [class*="css"] {
+        font-family: 'Inter', sans-serif;
+    }
+    
+    /* Header Gradient */
+    .main-header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+    }
+    
+    .main-header h1 {
+        font-size: 2.5rem;
+        font-weight: 700;
+        margin-bottom: 0.5rem;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
+    }
+    
+    .main-header p {
+        font-size: 1.2rem;
+        font-weight: 300;
+        opacity: 0.9;
+    }
+    
+    /* Login Container */
+    .login-container {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        padding: 3rem;
+        border-radius: 20px;
+        max-width: 450px;
+        margin: 2rem auto;
+        box-shadow: 0 20px 40px rgba(0,0,0,0.1);
+        color: white;
+    }
+    
+    .login-container h3 {
+        text-align: center;
+        font-size: 2rem;
+        margin-bottom: 1rem;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
+    }
+    
+    /* Card Styles */
+    .info-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 5px 15px rgba(0,0,0,0.08);
+        border-left: 4px solid #667eea;
+        margin: 1rem 0;
+    }
+    
+    .success-card {
+        background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        text-align: center;
+        margin: 1rem 0;
+        border: 1px solid #e0e0e0;
+    }
+    
+    .summary-card {
+        background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%);
+        padding: 1.5rem;
+        border-radius: 15px;
+        margin: 1rem 0;
+        box-shadow: 0 8px 25px rgba(0,0,0,0.1);
+    }
+    
+    .article-card {
+        background: white;
+        padding: 1.2rem;
+        border-radius: 10px;
+        margin: 0.8rem 0;
+        box-shadow: 0 3px 10px rgba(0,0,0,0.1);
+        border-left: 3px solid #4CAF50;
+        transition: transform 0.2s ease;
+    }
+    
+    .article-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 5px 20px rgba(0,0,0,0.15);
+    }
+    
+    .history-card {
+        background: linear-gradient(135deg, #e3ffe7 0%, #d9e7ff 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+        border: 1px solid #e0e0e0;
+    }
+    
+    /* Button Styles */
+    .stButton > button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.6rem 1.2rem;
+        font-weight: 500;
+        transition: all 0.3s ease;
+        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-1px);
+        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6);
+    }
+    
+    /* Example Button Styles */
+    .example-btn {
+        background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%);
+        border: none;
+        border-radius: 20px;
+        padding: 0.5rem 1rem;
+        color: #333;
+        font-weight: 500;
+        margin: 0.2rem;
+        transition: all 0.3s ease;
+        cursor: pointer;
+    }
+    
+    .example-btn:hover {
+        transform: scale(1.05);
+        box-shadow: 0 5px 15px rgba(255, 154, 158, 0.4);
+    }
+    
+    /* Text Area Styles */
+    .stTextArea textarea {
+        border-radius: 10px;
+        border: 2px solid #e0e0e0;
+        font-family: 'Inter', sans-serif;
+        transition: border-color 0.3s ease;
+    }
+    
+    .stTextArea textarea:focus {
+        border-color: #667eea;
+        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
+    }
+    
+    /* Sidebar Styles */
+    .css-1d391kg {
+        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
+    }
+    
+    /* Stats Cards */
+    .stats-container {
+        display: flex;
+        gap: 1rem;
+        margin: 1rem 0;
+    }
+    
+    .stat-card {
+        flex: 1;
+        background: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        text-align: center;
+        box-shadow: 0 5px 15px rgba(0,0,0,0.08);
+        border-top: 4px solid;
+    }
+    
+    .stat-card.queries {
+        border-top-color: #4CAF50;
+    }
+    
+    .stat-card.summaries {
+        border-top-color: #2196F3;
+    }
+    
+    .stat-card.articles {
+        border-top-color: #FF9800;
+    }
+    
+    .stat-number {
+        font-size: 2rem;
+        font-weight: 700;
+        margin-bottom: 0.5rem;
+    }
+    
+    .stat-label {
+        color: #666;
+        font-size: 0.9rem;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    
+    /* Download Button Special Styling */
+    .download-btn {
+        background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
+    }
+    
+    /* Animation for loading */
+    @keyframes pulse {
+        0% { opacity: 1; }
+        50% { opacity: 0.5; }
+        100% { opacity: 1; }
+    }
+    
+    .loading {
+        animation: pulse 1.5s ease-in-out infinite;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# 📊 Initialize session state for stats
+if 'total_queries' not in st.session_state:
+    st.session_state.total_queries = 0
+if 'total_summaries' not in st.session_state:
+    st.session_state.total_summaries = 0
+if 'total_articles' not in st.session_state:
+    st.session_state.total_articles = 0
+
+# 📌 Enhanced User Authentication with modern UI
+def handle_authentication():
+    if 'authenticated' not in st.session_state:
+        st.session_state.authenticated = False
+
+    if not st.session_state.authenticated:
+        st.markdown("""
+            <div class='login-container'>
+                <h3>🔐 Welcome Back!</h3>
+                <p style='text-align: center; margin-bottom: 2rem; opacity: 0.9;'>
+                    Please login to access the AI News Research Dashboard
+                </p>
+                <div style='background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem;'>
+                    <p style='margin: 0; font-size: 0.9rem;'>
+                        <strong>Demo Credentials:</strong><br>
+                        Username: <code>Sukriti</code><br>
+                        Password: <code>Sukriti123</code>
+                    </p>
+                </div>
+            </div>
+        """, unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            username = st.text_input("👤 Username", placeholder="Enter username", key="username")
+            password = st.text_input("🔑 Password", type="password", placeholder="Enter password", key="password")
+            
+            if st.button("🚀 Login", use_container_width=True):
+                if username == "Sukriti" and password == "Sukriti123":
+                    st.session_state.authenticated = True
+                    st.session_state.user = username
+                    st.success("✅ Login successful! Redirecting...")
+                    st.rerun()
+                else:
+                    st.error("❌ Invalid credentials. Please try again.")
+        st.stop()
+
+# 📈 Dashboard Stats Display
+def show_dashboard_stats():
+    st.markdown("""
+        <div class='stats-container'>
+            <div class='stat-card queries'>
+                <div class='stat-number' style='color: #4CAF50;'>{}</div>
+                <div class='stat-label'>Total Queries</div>
+            </div>
+            <div class='stat-card summaries'>
+                <div class='stat-number' style='color: #2196F3;'>{}</div>
+                <div class='stat-label'>Summaries Generated</div>
+            </div>
+            <div class='stat-card articles'>
+                <div class='stat-number' style='color: #FF9800;'>{}</div>
+                <div class='stat-label'>Articles Processed</div>
+            </div>
+        </div>
+    """.format(
+        st.session_state.total_queries,
+        st.session_state.total_summaries,
+        st.session_state.total_articles
+    ), unsafe_allow_html=True)
+
+# 🗄️ Persistent query history shared by all sessions of this process
+@st.cache_resource
+def get_history_store():
+    return HistoryStore(os.getenv("HISTORY_DB", "news_history.db"))
+
+def current_user():
+    return st.session_state.get("user", "Sukriti")
+
+def history_card(label, query, response, created):
+    st.markdown(f"""
+        <div class='history-card'>
+            <h4 style='color: #333; margin-bottom: 0.5rem;'>
+                🔍 {label}: {query}
+            </h4>
+            <p style='color: #666; font-size: 0.9rem; margin: 0;'>
+                {response[:150]}{'...' if len(response) > 150 else ''}
+            </p>
+            <small style='color: #999;'>
+                📅 {datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M')}
+            </small>
+        </div>
+    """, unsafe_allow_html=True)
+
+# 📚 Enhanced History Display (paged, newest first)
+HISTORY_PAGE_SIZE = 5
+
+def show_history():
+    store = get_history_store()
+    total = store.count(current_user())
+    if total:
+        st.markdown("""
+            <div style='margin-top: 2rem;'>
+                <h3 style='text-align:center; color: #667eea; margin-bottom: 1rem;'>
+                    📚 Recent Query History
+                </h3>
+            </div>
+        """, unsafe_allow_html=True)
+
+        pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page = min(st.session_state.get("history_page", 0), pages - 1)
+        for idx, entry in enumerate(store.page(current_user(), page, HISTORY_PAGE_SIZE), page * HISTORY_PAGE_SIZE + 1):
+            history_card(f"Query {idx}", entry["query"], entry["summary"], entry["created"])
+
+        if pages > 1:
+            prev_col, info_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                if st.button("⬅️ Newer", use_container_width=True, disabled=page == 0):
+                    st.session_state.history_page = page - 1
+                    st.rerun()
+            with info_col:
+                st.markdown(f"<p style='text-align: center; color: #666;'>Page {page + 1} of {pages}</p>",
+                            unsafe_allow_html=True)
+            with next_col:
+                if st.button("Older ➡️", use_container_width=True, disabled=page >= pages - 1):
+                    st.session_state.history_page = page + 1
+                    st.rerun()
+
+# 🔎 Full-text search over past research
+def show_history_search():
+    search = st.text_input("🔎 Search past research", placeholder="e.g. ceasefire", key="history_search")
+    if search:
+        results = get_history_store().search(current_user(), search)
+        if not results:
+            st.caption("No matching summaries.")
+        for entry in results:
+            with st.expander(f"🔍 {entry['query']}"):
+                st.caption(datetime.fromtimestamp(entry["created"]).strftime('%Y-%m-%d %H:%M'))
+                st.markdown(entry["summary"])
+
+# ♻️ Enhanced Reset Function
+def reset_all():
+    preserved_keys = {'authenticated', 'user', 'total_queries', 'total_summaries', 'total_articles'}
+    for key in list(st.session_state.keys()):
+        if key not in preserved_keys:
+            del st.session_state[key]
+    st.session_state.query_input = ""
+    st.success("🔄 Dashboard reset successfully!")
+    st.rerun()
+
+# 🧾 Summary bullet list markup (shared by streaming and final render)
+def summary_list_html(bullets):
+    return f"""
+        <div style='background: linear-gradient(135deg, #e3f2fd 0%, #f3e5f5 100%); 
+                    padding: 1.5rem; border-radius: 12px; border-left: 4px solid #2196F3;'>
+            <ul style='padding-left: 1.5rem; margin: 0; line-height: 1.8;'>
+                {''.join([f'<li style="margin-bottom: 0.8rem; color: #333;">{bullet}</li>' for bullet in bullets])}
+            </ul>
+        </div>
+    """
+
+# 🎯 Quick start examples (also kept warm in the summary cache)
+EXAMPLES = [
+    "Explosive growth in AI technologies like AI video generators and agents",
+    " India-Pakistan Tensions",
+    " Israel-Iran Conflict Updates",
+    " IPL 2025 Match Highlights"
+]
+
+def example_query(example):
+    return example.split(" ", 1)[1]  # Remove emoji
+
+# 🔥 One background refresher per process keeps example and trending queries cached
+@st.cache_resource
+def start_prewarmer():
+    return Prewarmer(
+        [example_query(example) for example in EXAMPLES],
+        interval=float(os.getenv("PREWARM_INTERVAL", "0")),
+        top_n=int(os.getenv("PREWARM_TOP_N", "5")),
+    ).start()
+
+# 🧩 Result rendering (used right after generation and on every later rerun)
+def header_html(header_line):
+    return f"""
+        <div class='summary-card'>
+            <h3 style='margin: 0; color: #333; text-align: center;'>
+                📰 {header_line}
+            </h3>
+        </div>
+    """
+
+def article_card_html(i, article):
+    title, source, date, url = article_fields(article)
+    return f"""
+        <div class='article-card'>
+            <h4 style='color: #333; margin-bottom: 0.8rem;'>
+                📄 Article {i}: {title}
+            </h4>
+            <div style='display: flex; justify-content: space-between; align-items: center; 
+                       flex-wrap: wrap; gap: 1rem;'>
+                <div>
+                    <span style='background: #e8f5e8; padding: 0.3rem 0.8rem; 
+                               border-radius: 15px; font-size: 0.8rem; color: #2e7d32;'>
+                        📅 {date}
+                    </span>
+                    <span style='background: #e3f2fd; padding: 0.3rem 0.8rem; 
+                               border-radius: 15px; font-size: 0.8rem; color: #1976d2; margin-left: 0.5rem;'>
+                        🏷️ {source}
+                    </span>
+                </div>
+                <a href='{url}' target='_blank' style='text-decoration: none; 
+                   background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                   color: white; padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.8rem;'>
+                    🔗 Read Full Article
+                </a>
+            </div>
+        </div>
+    """
+
+def summary_slots():
+    header_slot = st.empty()
+
+    # Display AI Summary
+    st.markdown("""
+        <div class='info-card'>
+            <h3 style='color: #667eea; margin-bottom: 1rem; text-align: center;'>
+                🧠 AI-Generated News Summary
+            </h3>
+        </div>
+    """, unsafe_allow_html=True)
+    return header_slot, st.empty()
+
+def render_result(result, header_slot, summary_slot):
+    # Display Header
+    header_slot.markdown(result["header_html"], unsafe_allow_html=True)
+    summary_slot.markdown(result["summary_html"], unsafe_allow_html=True)
+
+    if result["stale_age"] is not None:
+        st.info(f"⏳ The AI service is slow or unavailable, so this is the summary from "
+                f"{int(result['stale_age'] // 60)} min ago. A fresh one is being prepared in the background.")
+
+    # Display Articles
+    if result["article_cards"]:
+        st.markdown("""
+            <div style='margin-top: 2rem;'>
+                <h3 style='color: #667eea; margin-bottom: 1rem; text-align: center;'>
+                    📰 Source Articles Analyzed
+                </h3>
+            </div>
+        """, unsafe_allow_html=True)
+        for card in result["article_cards"]:
+            st.markdown(card, unsafe_allow_html=True)
+
+        # Success message
+        st.markdown(f"""
+            <div class='success-card'>
+                <span style='color: #2e7d32; font-weight: 600;'>
+                    ✅ Successfully analyzed {len(result["article_cards"])} articles and generated comprehensive summary!
+                </span>
+            </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ No articles found for this query. Please try a different search term.")
+
+    # Download Buttons
+    stamp = result["generated_at"].strftime('%Y%m%d_%H%M%S')
+    st.markdown("<div style='margin-top: 2rem;'></div>", unsafe_allow_html=True)
+    col_download1, col_download2 = st.columns(2)
+    
+    with col_download1:
+        st.download_button(
+            "📥 Download as TXT", 
+            data=result["combined_output"], 
+            file_name=f"news_summary_{stamp}.txt", 
+            mime="text/plain", 
+            use_container_width=True
+        )
+
+    with col_download2:
+        # The PDF is only built when asked for, then memoized on the result
+        if result["pdf_bytes"] is None:
+            if st.button("📄 Prepare PDF", use_container_width=True):
+                result["pdf_bytes"] = create_pdf(result["combined_output"]).getvalue()
+                st.rerun()
+        else:
+            st.download_button(
+                "📄 Download as PDF", 
+                data=result["pdf_bytes"], 
+                file_name=f"news_summary_{stamp}.pdf", 
+                mime="application/pdf", 
+                use_container_width=True
+            )
+
+# 🧠 Enhanced Main Summary Generation Function
+def generate_summary_and_output():
+    # Main Header
+    st.markdown("""
+        <div class='main-header'>
+            <h1>🤖 AI News Research Dashboard</h1>
+            <p>Intelligent news analysis powered by advanced AI technology</p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # Dashboard Stats
+    show_dashboard_stats()
+    
+    # Example Queries Section
+    st.markdown("""
+        <div class='info-card'>
+            <h4 style='color: #667eea; margin-bottom: 1rem;'>🎯 Quick Start Examples</h4>
+            <p style='margin-bottom: 1rem; color: #666;'>
+                Click any example below to auto-fill your query and get started instantly!
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    example_cols = st.columns(len(EXAMPLES))
+    for i, example in enumerate(EXAMPLES):
+        with example_cols[i]:
+            if st.button(example, use_container_width=True, key=f"example_{i}"):
+                st.session_state.query_input = example_query(example)
+
+    # Query Input Section
+    st.markdown("""
+        <div style='margin-top: 2rem;'>
+            <h4 style='text-align:center; color: #667eea; margin-bottom: 1rem;'>
+                🔍 Enter Your Research Query
+            </h4>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    query = st.text_area(
+        "", 
+        key="query_input", 
+        height=100, 
+        label_visibility="collapsed",
+        placeholder="Type your news research query here... (e.g., 'Latest developments in AI technology')"
+    )
+
+    # Action Buttons
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        gen_btn = st.button("⚡ Generate AI Summary", use_container_width=True)
+    with col2:
+        reset_btn = st.button("🔄 Reset Dashboard", use_container_width=True)
+    with col3:
+        if st.button("📊 Refresh Stats", use_container_width=True):
+            st.rerun()
+
+    opt_col1, opt_col2 = st.columns([1, 2])
+    with opt_col1:
+        stream_mode = st.toggle("📡 Stream summary live", value=True, help="Show bullets as the AI writes them")
+        fuzzy_match = st.toggle("🔁 Reuse similar queries", value=True,
+                                help="Serve a recent result for a near-identical query instead of fetching again")
+    with opt_col2:
+        summary_mode = st.radio(
+            "🧩 Summarization mode",
+            ["single", "auto", "map_reduce"],
+            format_func={"single": "Single pass", "auto": "Auto", "map_reduce": "Map-reduce (large article sets)"}.get,
+            horizontal=True,
+            help="Map-reduce summarizes article chunks in parallel and merges them; streaming applies to single pass only"
+        )
+
+    if reset_btn:
+        reset_all()
+
+    if gen_btn:
+        if query:
+            # Update query counter
+            st.session_state.total_queries += 1
+
+            header_slot, summary_slot = summary_slots()
+
+            stale_age = None
+            if stream_mode and summary_mode == "single" and llm_available():
+                # Fill the summary card bullet by bullet as tokens arrive
+                with st.spinner('🔄 Fetching news articles...'):
+                    chunks, articles = stream_summary(query, fuzzy=fuzzy_match)
+                response = ""
+                for chunk in chunks:
+                    response += chunk
+                    summary_slot.markdown(summary_list_html(
+                        line.strip() for line in response.split("•") if line.strip()
+                    ), unsafe_allow_html=True)
+            else:
+                # Show loading animation
+                with st.spinner('🔄 AI is analyzing news articles...'):
+                    result = get_summary_with_status(query, mode=summary_mode, fuzzy=fuzzy_match)
+                response, articles = result["summary"], result["articles"]
+                if result["stale"]:
+                    stale_age = result["age_seconds"]
+                
+            # Process response
+            header_line, formatted_summary = split_summary(response, articles)
+            top_articles = articles[:3] if articles else []
+            articles_text = format_articles_text(top_articles)
+            
+            # Update summary counter
+            st.session_state.total_summaries += 1
+            st.session_state.total_articles += len(articles) if articles else 0
+
+            # Save to history
+            get_history_store().add(current_user(), query, formatted_summary)
+            st.session_state.history_page = 0
+
+            # Keep the result so reruns (downloads, refresh, paging) re-render instead of regenerating
+            st.session_state.last_result = {
+                "query": query,
+                "generated_at": datetime.now(),
+                "stale_age": stale_age,
+                "header_html": header_html(header_line),
+                "summary_html": summary_list_html(
+                    line[1:].strip() for line in formatted_summary.splitlines() if line.strip() and line.startswith('•')
+                ),
+                "article_cards": [article_card_html(i, article) for i, article in enumerate(top_articles, 1)],
+                # Prepare download content
+                "combined_output": build_report(query, header_line, formatted_summary, articles_text),
+                "pdf_bytes": None,
+            }
+            render_result(st.session_state.last_result, header_slot, summary_slot)
+        else:
+            st.error("⚠️ Please enter a research query to generate summary.")
+    elif st.session_state.get("last_result"):
+        render_result(st.session_state.last_result, *summary_slots())
+
+# 🛠️ Process-wide pipeline metrics for the admin panel
+def show_admin_metrics():
+    snapshot = metrics.REGISTRY.snapshot()
+    counters = snapshot["counters"]
+
+    def total(name, **labels):
+        return sum(
+            value for (metric, key), value in counters.items()
+            if metric == name and all(pair in key for pair in labels.items())
+        )
+
+    rows = []
+    for (name, key), hist in sorted(snapshot["histograms"].items()):
+        if name != "news_stage_duration_seconds":
+            continue
+        stage = dict(key)["stage"]
+        rows.append({
+            "Stage": stage,
+            "Calls": hist["count"],
+            "p50 (ms)": round(hist["p50"] * 1000, 1),
+            "p95 (ms)": round(hist["p95"] * 1000, 1),
+            "Errors": int(total("news_stage_errors_total", stage=stage)),
+        })
+    if rows:
+        st.table(rows)
+    else:
+        st.caption("No pipeline activity recorded yet.")
+
+    hits = total("summary_cache_requests_total", result="hit")
+    lookups = hits + total("summary_cache_requests_total", result="miss")
+    st.metric("🎯 Cache Hit Rate", f"{hits / lookups:.0%}" if lookups else "n/a")
+    st.metric("📝 Prompt Tokens", int(total("llm_prompt_tokens_total")))
+    st.metric("💬 Completion Tokens", int(total("llm_completion_tokens_total")))
+
+    small = total("llm_route_total", model="small")
+    routed = small + total("llm_route_total", model="large")
+    escalations = total("llm_escalations_total")
+    st.metric("🪶 Small-Model Share", f"{small / routed:.0%}" if routed else "n/a")
+    st.metric("⤴️ Escalation Rate", f"{escalations / (small + escalations):.0%}" if small + escalations else "n/a")
+
+    for (name, key), depth in sorted(snapshot["gauges"].items()):
+        if name != "scheduler_queue_depth":
+            continue
+        provider = dict(key)["provider"]
+        wait = snapshot["histograms"].get(("scheduler_wait_seconds", key))
+        p95 = f"{wait['p95'] * 1000:.0f} ms" if wait else "n/a"
+        st.caption(f"⏱️ {provider}: {int(depth)} queued · p95 wait {p95}")
+
+# 🏃‍♂️ Sidebar Navigation
+def show_sidebar():
+    with st.sidebar:
+        st.markdown("""
+            <div style='text-align: center; padding: 1rem; color: white;'>
+                <h2>🎛️ Dashboard</h2>
+                <p>Control Panel</p>
+            </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # User info
+        st.markdown("""
+            <div style='background: rgba(255,255,255,0.1); padding: 1rem; 
+                       border-radius: 10px; color: white; text-align: center; margin-bottom: 1rem;'>
+                <h4>👤 Welcome, Sukriti!</h4>
+                <p style='margin: 0; opacity: 0.8;'>Premium User</p>
+            </div>
+        """, unsafe_allow_html=True)
+        
+        # Quick stats
+        st.metric("🔍 Queries Today", st.session_state.total_queries)
+        st.metric("📄 Summaries", st.session_state.total_summaries)
+        st.metric("📰 Articles Analyzed", st.session_state.total_articles)
+        
+        st.markdown("---")
+
+        show_history_search()
+
+        st.markdown("---")
+
+        with st.expander("🛠️ Admin Metrics"):
+            show_admin_metrics()
+        
+        if st.button("🚪 Logout", use_container_width=True):
+            st.session_state.authenticated = False
+            st.rerun()
+
+# 🚀 Main App Execution
+def main():
+    # Off by default: each cycle spends NewsAPI quota (set e.g. PREWARM_INTERVAL=600 to enable)
+    if float(os.getenv("PREWARM_INTERVAL", "0")) > 0:
+        start_prewarmer()
+    handle_authentication()
+    show_sidebar()
+    generate_summary_and_output()
+    show_history()
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+
+import langchain_config
+import metrics
+from scheduler import BATCH, QuotaExceededError, priority
+from summary_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class Prewarmer:
+    """Background thread that keeps hot queries in the summary cache.
+
+    Every ``interval`` seconds it re-summarizes the static queries (e.g. the
+    dashboard examples) plus the ``top_n`` most frequent recent queries. Refreshes
+    run at batch priority, so the rate-limit scheduler admits interactive calls
+    first. The refresher also backs off while any provider queue has waiters,
+    and skips the rest of a cycle once the quota share left for batch work is
+    used up. Warmed results stay reusable for similar queries until the next
+    cycle (``hold_result``); QUERY_MATCH_TTL is left alone for everything else.
+    """
+
+    def __init__(self, static_queries, interval=600, top_n=5, pause=2.0, busy_wait=30.0):
+        self.static_queries = list(static_queries)
+        self.interval = interval
+        self.top_n = top_n
+        self.pause = pause
+        self.busy_wait = busy_wait
+        self._stop = threading.Event()
+        self._thread = None
+
+    def hot_queries(self):
+        seen, queries = set(), []
+        for query in self.static_queries + langchain_config.frequent_queries(self.top_n):
+            key = normalize_query(query)
+            if key and key not in seen:
+                seen.add(key)
+                queries.append(query)
+        return queries
+
+    def _wait_until_idle(self):
+        deadline = time.monotonic() + self.busy_wait
+        while time.monotonic() < deadline and not self._stop.is_set():
+            if not (langchain_config.groq_limiter.queue_depth() or langchain_config.newsapi_limiter.queue_depth()):
+                return
+            self._stop.wait(0.5)
+
+    def refresh_once(self):
+        for query in self.hot_queries():
+            if self._stop.is_set():
+                return
+            self._wait_until_idle()
+            try:
+                with priority(BATCH):
+                    # fuzzy=False: a refresh must not be answered from the similar-query cache
+                    langchain_config.get_summary(query, fuzzy=False)
+                # Reusable until the next cycle refreshes it, or example clicks still pay a NewsAPI round-trip
+                langchain_config.hold_result(query, ttl=self.interval * 1.5)
+                metrics.inc("prewarm_refreshes_total", result="ok")
+            except QuotaExceededError as exc:
+                metrics.inc("prewarm_refreshes_total", result="quota")
+                logger.warning("Pre-warming paused until the next cycle: %s", exc)
+                return
+            except Exception:
+                metrics.inc("prewarm_refreshes_total", result="error")
+                logger.exception("Pre-warming %r failed", query)
+            self._stop.wait(self.pause)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="prewarmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,162 @@
+import math
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+
+import context_builder
+from context_builder import words
+
+# The shared function words plus news filler ("latest", "update") that don't change
+# the topic. "us" and "new" are deliberately absent ("US", "New York").
+STOPWORDS = context_builder.STOPWORDS | frozenset("""
+about into over between vs versus been what whats happening
+latest news update updates today breaking live current recent
+""".split())
+
+
+def _stem(word):
+    # Light suffix stripping; enough to fold plurals and simple verb forms
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in (("ies", "y"), ("sses", "ss"), ("ing", ""), ("ed", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def query_terms(query):
+    text = unicodedata.normalize("NFKD", query or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return sorted({_stem(w) for w in words(text) if w not in STOPWORDS})
+
+
+def canonicalize_query(query):
+    """Case/punctuation-folded, stemmed, stopword-free, order-independent form of a query.
+
+    " India-Pakistan Tensions", "india pakistan tension" and
+    "India–Pakistan tensions latest" all become ``"india pakistan tension"``.
+    """
+    return " ".join(query_terms(query))
+
+
+def _vector(terms):
+    # Whole terms plus character trigrams, so small typos still land close
+    features = Counter(terms)
+    for term in terms:
+        padded = f"#{term}#"
+        features.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    norm = math.sqrt(sum(v * v for v in features.values())) or 1.0
+    return {f: v / norm for f, v in features.items()}
+
+
+def _edit_distance_at_most_one(a, b):
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:] if len(a) < len(b) else a[i + 1:] == b[i:]
+
+
+def _same_term(a, b):
+    # Anything with a digit (years, quarters, scores) must match exactly; words may carry one typo
+    if a == b:
+        return True
+    if any(ch.isdigit() for ch in a + b) or min(len(a), len(b)) < 4:
+        return False
+    return _edit_distance_at_most_one(a, b)
+
+
+def same_topic(terms, other_terms):
+    """True when both term lists pair up one-to-one, allowing a one-letter typo per word.
+
+    Adding or dropping a content term ("tesla earnings" vs "tesla earnings q3")
+    always changes the topic.
+    """
+    if len(terms) != len(other_terms):
+        return False
+    remaining = list(other_terms)
+    for term in terms:
+        for idx, other in enumerate(remaining):
+            if _same_term(term, other):
+                del remaining[idx]
+                break
+        else:
+            return False
+    return True
+
+
+class QueryIndex:
+    """In-process similarity index over the canonical forms of recent queries.
+
+    ``match`` returns the canonical key of the most similar indexed query when
+    both have the same terms up to a one-letter typo per word (see
+    ``same_topic``) and their cosine similarity reaches ``threshold`` (an
+    identical canonical form always matches). Candidates are found through the terms they share, so a
+    lookup only scores queries with at least one term in common.
+    """
+
+    def __init__(self, threshold=0.8, max_entries=1000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors = OrderedDict()
+        self._postings = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def add(self, query):
+        terms = query_terms(query)
+        key = " ".join(terms)
+        if not key:
+            return key
+        with self._lock:
+            if key in self._vectors:
+                self._vectors.move_to_end(key)
+                return key
+            self._vectors[key] = _vector(terms)
+            for term in terms:
+                self._postings[term].add(key)
+            while len(self._vectors) > self.max_entries:
+                self._forget(next(iter(self._vectors)))
+        return key
+
+    def _forget(self, key):
+        del self._vectors[key]
+        for term in key.split():
+            keys = self._postings.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[term]
+
+    def match(self, query, threshold=None):
+        """Returns ``(canonical_key, similarity)``; the key is None when nothing reaches the threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        terms = query_terms(query)
+        key = " ".join(terms)
+        if not key:
+            return None, 0.0
+        with self._lock:
+            if key in self._vectors:
+                self._vectors.move_to_end(key)
+                return key, 1.0
+            candidates = set().union(*(self._postings.get(t, ()) for t in terms))
+            vec = _vector(terms)
+            best, best_score = None, 0.0
+            for candidate in candidates:
+                if not same_topic(terms, candidate.split()):
+                    continue
+                other = self._vectors[candidate]
+                score = sum(w * other.get(f, 0.0) for f, w in vec.items())
+                if score > best_score:
+                    best, best_score = candidate, score
+            if best is None or best_score < threshold:
+                return None, best_score
+            self._vectors.move_to_end(best)
+            return best, best_score
+
+    def __len__(self):
+        return len(self._vectors)
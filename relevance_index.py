@@ -0,0 +1,74 @@
+import hashlib
+import math
+import threading
+from collections import Counter, OrderedDict
+
+from context_builder import words
+
+
+def _bucket(term, n_features):
+    value = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value % n_features
+
+
+class RelevanceIndex:
+    """Hashing-vectorizer index that ranks articles against a query.
+
+    Term-frequency vectors are cached per article (URL + text hash), so the same
+    article showing up again for a repeated or overlapping query is not
+    re-tokenized. IDF weights are computed over each candidate set at query time.
+    """
+
+    def __init__(self, n_features=1 << 20, max_entries=5000):
+        self.n_features = n_features
+        self.max_entries = max_entries
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def vectorize(self, text):
+        counts = Counter(_bucket(w, self.n_features) for w in words(text))
+        return {b: 1 + math.log(tf) for b, tf in counts.items()}
+
+    def _article_vector(self, article):
+        text = article.headline_text
+        key = (article.url, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+        with self._lock:
+            vec = self._vectors.get(key)
+            if vec is not None:
+                self._vectors.move_to_end(key)
+                return vec
+        vec = self.vectorize(text)
+        with self._lock:
+            self._vectors[key] = vec
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+        return vec
+
+    def rank(self, query, articles):
+        """Returns ``(score, article)`` pairs, best first; ties keep input order."""
+        articles = list(articles)
+        vectors = [self._article_vector(a) for a in articles]
+        doc_freq = Counter(b for vec in vectors for b in vec)
+        total = len(vectors)
+        idf = {b: math.log((1 + total) / (1 + df)) + 1 for b, df in doc_freq.items()}
+
+        def weighted(vec):
+            out = {b: w * idf.get(b, 0.0) for b, w in vec.items()}
+            norm = math.sqrt(sum(v * v for v in out.values())) or 1.0
+            return {b: v / norm for b, v in out.items()}
+
+        query_vec = weighted(self.vectorize(query))
+        scored = []
+        for idx, vec in enumerate(vectors):
+            doc_vec = weighted(vec)
+            score = sum(w * doc_vec.get(b, 0.0) for b, w in query_vec.items())
+            scored.append((score, idx))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        return [(score, articles[idx]) for score, idx in scored]
+
+    def top_k(self, query, articles, k):
+        ranked = self.rank(query, articles)
+        return [article for _, article in (ranked[:k] if k else ranked)]
+
+    def __len__(self):
+        return len(self._vectors)
@@ -0,0 +1,88 @@
+import io
+from datetime import datetime
+
+import metrics
+
+
+def split_summary(response, articles):
+    """Returns ``(header_line, formatted_summary)`` the way the dashboard shows them."""
+    with metrics.timed("bullet_parse"):
+        bullet_lines = [f"• {line.strip()}" for line in response.split("•") if line.strip()]
+        header_line = (articles[0].title or "Top News") if articles else (bullet_lines[0][1:].strip() if bullet_lines else "AI News Summary")
+        formatted_summary = "\n".join(bullet_lines[1:]) if len(bullet_lines) > 1 else response
+    return header_line, formatted_summary
+
+
+def article_fields(article):
+    title = article.title or "No title available"
+    date = article.published_at.strftime("%Y-%m-%d") if article.published_at else "Unknown Date"
+    return title, article.source, date, article.url or "#"
+
+
+def format_articles_text(articles):
+    articles_text = ""
+    for i, article in enumerate(articles, 1):
+        title, source, date, url = article_fields(article)
+        articles_text += f"Article {i}: {title}\nDate: {date} | Source: {source}\nURL: {url}\n\n"
+    return articles_text
+
+
+def build_report(query, header_line, formatted_summary, articles_text):
+    return f"""AI News Research Summary
+Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+Query: {query}
+
+Top News Header: {header_line}
+
+🧠 AI-Generated News Summary:
+{formatted_summary.strip()}
+
+📰 Source Articles Analyzed:
+{articles_text.strip()}
+
+---
+Generated by AI News Research Dashboard
+"""
+
+
+def create_pdf(text_data):
+    with metrics.timed("create_pdf"):
+        return _render_pdf(text_data)
+
+
+def _render_pdf(text_data):
+    # reportlab is only imported once a PDF is actually built
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    
+    # Add header
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(72, height - 72, "AI News Research Summary")
+    c.setFont("Helvetica", 10)
+    c.drawString(72, height - 90, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # Add content
+    textobject = c.beginText()
+    textobject.setTextOrigin(72, height - 120)
+    textobject.setFont("Helvetica", 11)
+    
+    wrap_width = 85
+    for line in text_data.split("\n"):
+        while len(line) > wrap_width:
+            space_pos = line.rfind(' ', 0, wrap_width)
+            if space_pos == -1:
+                space_pos = wrap_width
+            textobject.textLine(line[:space_pos])
+            line = line[space_pos:].strip()
+        textobject.textLine(line.strip())
+    
+    c.drawText(textobject)
+    c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,133 @@
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import metrics
+
+INTERACTIVE = 0
+BATCH = 10
+
+_priority = contextvars.ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level):
+    """Runs the enclosed calls at ``level``; propagates to pool threads that copy the context."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+class QuotaExceededError(RuntimeError):
+    """The provider's daily quota is used up; waiting would not help until it resets."""
+
+
+class TokenBucket:
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount):
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class ProviderLimiter:
+    """Priority-ordered admission against request/token buckets and a daily quota.
+
+    A limit of 0 disables that check. Waiters are admitted strictly in
+    (priority, arrival) order, so interactive calls overtake queued batch work.
+    The last ``interactive_reserve`` share of the daily quota is kept for
+    interactive calls: lower-priority calls get QuotaExceededError once the
+    rest is used.
+    """
+
+    def __init__(self, name, requests_per_minute=0, tokens_per_minute=0, daily_quota=0, interactive_reserve=0.0):
+        self.name = name
+        self.interactive_reserve = interactive_reserve
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.daily_quota = daily_quota
+        self._day = None
+        self._used_today = 0
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+
+    def _check_quota(self, level=INTERACTIVE):
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day, self._used_today = today, 0
+        if not self.daily_quota:
+            return
+        if self._used_today >= self.daily_quota:
+            raise QuotaExceededError(f"{self.name} daily quota of {self.daily_quota} requests is used up")
+        if level > INTERACTIVE and self._used_today >= self.daily_quota * (1 - self.interactive_reserve):
+            raise QuotaExceededError(f"{self.name} daily quota left for batch work is used up "
+                                     f"({self.interactive_reserve:.0%} is reserved for interactive requests)")
+
+    def _wait_time(self, tokens):
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens is not None and tokens:
+            waits.append(self.tokens.wait_time(tokens))
+        return max(waits)
+
+    def acquire(self, tokens=0, level=None):
+        """Blocks until this call may proceed; returns the seconds spent waiting."""
+        level = current_priority() if level is None else level
+        start = time.monotonic()
+        with self._cond:
+            self._check_quota(level)
+            entry = (level, next(self._seq))
+            heapq.heappush(self._queue, entry)
+            metrics.set_gauge("scheduler_queue_depth", len(self._queue), provider=self.name)
+            try:
+                while True:
+                    if self._queue[0] == entry:
+                        delay = self._wait_time(tokens)
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                    self._check_quota(level)
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                metrics.set_gauge("scheduler_queue_depth", len(self._queue), provider=self.name)
+                self._cond.notify_all()
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None and tokens:
+                self.tokens.take(tokens)
+            self._used_today += 1
+        waited = time.monotonic() - start
+        metrics.observe("scheduler_wait_seconds", waited, provider=self.name)
+        return waited
+
+    def queue_depth(self):
+        with self._cond:
+            return len(self._queue)
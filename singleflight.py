@@ -0,0 +1,147 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one shared execution.
+
+    The work runs on a pool thread rather than on the first caller's thread, so
+    any caller (including the first) can stop waiting without cancelling the
+    call the others are waiting on. Results and exceptions reach every waiter.
+    """
+
+    def __init__(self, max_workers=16):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="singleflight")
+        self._lock = threading.RLock()
+        self._calls = {}
+        self._on_start = {}  # key -> callbacks waiting for a queued call to start
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+                self._on_start.pop(key, None)
+
+    def _run(self, key, ctx, fn, args, kwargs):
+        with self._lock:
+            callbacks = self._on_start.pop(key, [])
+        for callback in callbacks:
+            callback()
+        return ctx.run(fn, *args, **kwargs)
+
+    def submit(self, key, fn, *args, executor=None, on_start=None, **kwargs):
+        """Returns the shared future for ``key``, starting ``fn`` if no call is in flight.
+
+        A new call runs on ``executor`` when given, else on the flight's own pool.
+        ``on_start`` is called once the shared call leaves the queue and starts
+        running (right away if it already has).
+        """
+        start_now = False
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                self._on_start[key] = []
+                # Run in the submitter's context so context vars (e.g. request priority) carry over
+                future = (executor or self._executor).submit(
+                    self._run, key, contextvars.copy_context(), fn, args, kwargs
+                )
+                self._calls[key] = future
+                future.add_done_callback(lambda f: self._forget(key, f))
+            if on_start is not None:
+                waiting = self._on_start.get(key)
+                if waiting is None:
+                    start_now = True
+                else:
+                    waiting.append(on_start)
+        if start_now:
+            on_start()
+        return future
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        # Raises concurrent.futures.TimeoutError for this waiter only
+        return self.submit(key, fn, *args, **kwargs).result(timeout=timeout)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class _Broadcast:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.meta = None
+        self.opened = False
+        self.done = False
+        self.error = None
+
+    def replay(self):
+        index = 0
+        while True:
+            with self.cond:
+                while index >= len(self.chunks) and not self.done:
+                    self.cond.wait()
+                if index < len(self.chunks):
+                    chunk = self.chunks[index]
+                    index += 1
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            yield chunk
+
+
+class StreamFlight:
+    """Coalesces concurrent streams that share a key into one producer.
+
+    ``open_stream`` returns ``(chunks, meta)``; it and the chunk iterator run to
+    completion on a pool thread, and every subscriber replays the chunks from
+    the start at its own pace. A subscriber that stops reading doesn't stop the
+    producer, so the others (and any caching at the end of the stream) still
+    see the whole output.
+    """
+
+    def __init__(self, max_workers=16):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="streamflight")
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def subscribe(self, key, open_stream, *args, **kwargs):
+        """Returns ``(chunk iterator, meta)`` once the shared stream is open."""
+        with self._lock:
+            broadcast = self._calls.get(key)
+            if broadcast is None:
+                broadcast = self._calls[key] = _Broadcast()
+                self._executor.submit(contextvars.copy_context().run, self._produce, key, broadcast,
+                                      open_stream, args, kwargs)
+        with broadcast.cond:
+            while not (broadcast.opened or broadcast.done):
+                broadcast.cond.wait()
+            if not broadcast.opened:
+                raise broadcast.error
+            return broadcast.replay(), broadcast.meta
+
+    def _produce(self, key, broadcast, open_stream, args, kwargs):
+        try:
+            chunks, meta = open_stream(*args, **kwargs)
+            with broadcast.cond:
+                broadcast.meta, broadcast.opened = meta, True
+                broadcast.cond.notify_all()
+            for chunk in chunks:
+                with broadcast.cond:
+                    broadcast.chunks.append(chunk)
+                    broadcast.cond.notify_all()
+        except BaseException as exc:
+            broadcast.error = exc
+        finally:
+            with self._lock:
+                if self._calls.get(key) is broadcast:
+                    del self._calls[key]
+            with broadcast.cond:
+                broadcast.done = True
+                broadcast.cond.notify_all()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from article import Article
+
+
+def normalize_query(query):
+    return ' '.join((query or '').lower().split())
+
+
+def fingerprint_articles(articles):
+    # Same articles (by URL + publish time) in any order -> same fingerprint
+    digest = hashlib.sha256()
+    for url, published in sorted((a.url, a.published_iso) for a in articles):
+        digest.update(f"{url}\x00{published}\x01".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _encode(value):
+    if isinstance(value, Article):
+        return {"__article__": value.to_dict()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj):
+    return Article.from_dict(obj["__article__"]) if "__article__" in obj else obj
+
+
+def dumps(value):
+    return json.dumps(value, default=_encode, separators=(',', ':'))
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+def make_cache_key(query, articles, variant=None):
+    key = f"{normalize_query(query)}|{fingerprint_articles(articles)}"
+    return f"{key}|{variant}" if variant else key
+
+
+class SummaryCache:
+    """Thread-safe TTL + LRU cache for summaries, optionally persisted to SQLite.
+
+    Values are JSON-serializable, and may include ``Article`` records. ``set``
+    takes an optional per-entry ``ttl``; it is kept in memory only, so reloaded
+    entries fall back to the cache-wide one.
+    """
+
+    def __init__(self, max_entries=256, ttl=900, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summary_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._load()
+
+    def _load(self):
+        cutoff = time.time() - self.ttl
+        self._db.execute("DELETE FROM summary_cache WHERE created < ?", (cutoff,))
+        rows = self._db.execute(
+            "SELECT key, value, created FROM summary_cache ORDER BY created DESC LIMIT ?",
+            (self.max_entries,)
+        ).fetchall()
+        self._db.commit()
+        for key, value, created in reversed(rows):
+            self._entries[key] = (created, loads(value), None)
+
+    def _delete(self, key):
+        del self._entries[key]
+        if self._db is not None:
+            self._db.execute("DELETE FROM summary_cache WHERE key = ?", (key,))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > (entry[2] or self.ttl):
+                self._delete(key)
+                if self._db is not None:
+                    self._db.commit()
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        created = time.time()
+        with self._lock:
+            self._entries[key] = (created, value, ttl)
+            self._entries.move_to_end(key)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO summary_cache (key, value, created) VALUES (?, ?, ?)",
+                    (key, dumps(value), created)
+                )
+            while len(self._entries) > self.max_entries:
+                self._delete(next(iter(self._entries)))
+            if self._db is not None:
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM summary_cache")
+                self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,82 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from article import Article
+from enrichment import PageCache, enrich_articles, extract_main_text
+
+BODY = "<p>" + "Officials confirmed the talks would resume next week in Geneva. " * 8 + "</p>"
+PAGES = {
+    "/full": f"<html><nav><p>{'Home News Sport Weather ' * 5}</p></nav><article>{BODY}</article></html>",
+    "/paywall": "<html><article><p>Subscribe to keep reading this story today.</p></article></html>",
+    "/slow": f"<html><article>{BODY}</article></html>",
+}
+
+
+@pytest.fixture
+def publisher():
+    """Local HTTP stand-in for news sites; records every path it serves."""
+    hits = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path == "/slow":
+                time.sleep(1.0)
+            body = PAGES.get(self.path, "").encode("utf-8")
+            self.send_response(200 if self.path in PAGES else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+
+
+def test_extract_prefers_article_body():
+    text = extract_main_text(PAGES["/full"])
+    assert text.startswith("Officials confirmed")
+    assert "Weather" not in text
+
+
+def test_full_text_fetched_once(publisher, tmp_path):
+    base, hits = publisher
+    cache = PageCache(str(tmp_path))
+    articles = [Article(url=f"{base}/full", description="teaser")]
+    first = enrich_articles(articles, cache=cache, budget=0.5)
+    second = enrich_articles(articles, cache=cache, budget=0.5)
+    assert first[0].full_text.startswith("Officials confirmed")
+    assert second[0].full_text == first[0].full_text
+    assert hits == ["/full"]
+
+
+def test_slow_and_short_pages_fall_back_and_are_not_retried(publisher, tmp_path):
+    base, hits = publisher
+    cache = PageCache(str(tmp_path))
+    articles = [Article(url=f"{base}/slow", description="a"), Article(url=f"{base}/paywall", description="b"),
+                Article(url=f"{base}/missing", description="c")]
+    start = time.monotonic()
+    enriched = enrich_articles(articles, cache=cache, budget=0.3)
+    assert time.monotonic() - start < 0.9  # the slow publisher is cut off at the budget
+    assert enriched == articles
+    enrich_articles(articles, cache=cache, budget=0.3)
+    assert sorted(hits) == ["/missing", "/paywall", "/slow"]
+
+
+def test_failed_pages_are_retried_after_ttl(publisher, tmp_path):
+    base, hits = publisher
+    cache = PageCache(str(tmp_path), retry_after=0)
+    articles = [Article(url=f"{base}/paywall")]
+    enrich_articles(articles, cache=cache, budget=0.5)
+    enrich_articles(articles, cache=cache, budget=0.5)
+    assert hits == ["/paywall", "/paywall"]
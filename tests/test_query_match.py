@@ -0,0 +1,25 @@
+import pytest
+
+from query_match import QueryIndex, canonicalize_query
+
+
+def test_canonical_form_folds_spelling_variants():
+    assert canonicalize_query(" India-Pakistan Tensions") == "india pakistan tension"
+    assert canonicalize_query("India–Pakistan tensions latest") == "india pakistan tension"
+
+
+@pytest.mark.parametrize("indexed, query", [
+    ("IPL 2025 Match Highlights", "IPL 2024 Match Highlights"),
+    ("Tesla earnings", "Tesla earnings Q3"),
+    ("ai regulation europe", "ai regulation"),
+])
+def test_different_topics_do_not_match(indexed, query):
+    index = QueryIndex()
+    index.add(indexed)
+    assert index.match(query)[0] is None
+
+
+def test_typo_matches_same_topic():
+    index = QueryIndex()
+    key = index.add("India-Pakistan tensions")
+    assert index.match("india pakistn tension")[0] == key
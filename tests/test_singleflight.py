@@ -0,0 +1,28 @@
+import threading
+
+from singleflight import SingleFlight
+
+
+def test_on_start_fires_when_a_queued_call_starts():
+    flight = SingleFlight(max_workers=1)
+    release = threading.Event()
+    started = []
+    blocker = flight.submit("a", release.wait)
+    queued = flight.submit("b", lambda: "b", on_start=lambda: started.append("b"))
+    assert started == []  # still waiting behind "a"
+    release.set()
+    assert queued.result(timeout=1) == "b"
+    assert started == ["b"]
+    blocker.result(timeout=1)
+
+
+def test_on_start_fires_at_once_for_a_running_call():
+    flight = SingleFlight(max_workers=1)
+    release, running = threading.Event(), threading.Event()
+    first = flight.submit("a", lambda: running.set() or release.wait())
+    assert running.wait(1)
+    started = []
+    assert flight.submit("a", lambda: None, on_start=lambda: started.append("a")) is first
+    assert started == ["a"]
+    release.set()
+    first.result(timeout=1)
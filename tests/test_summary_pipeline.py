@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+lc = pytest.importorskip("langchain_config")
+from query_match import QueryIndex
+from singleflight import SingleFlight
+from summary_cache import SummaryCache
+from transport import CircuitBreaker
+
+BULLETS = "• one\n• two\n• three\n• four\n• five"
+
+
+class FakeNewsApi:
+    def __init__(self, count=3):
+        self.count = count
+        self.calls = 0
+
+    def get_everything(self, **kwargs):
+        self.calls += 1
+        return {"articles": [
+            {"title": f"Story {i}", "url": f"https://example.com/{i}", "publishedAt": "2025-09-25T10:00:00Z",
+             "source": {"name": f"Source {i}"},
+             "description": f"Officials from both countries met on day {i} to discuss the border dispute."}
+            for i in range(self.count)
+        ]}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Fresh caches and breaker, a fake NewsAPI and a counting stand-in for the LLM call."""
+    news = FakeNewsApi()
+    prompts = []
+
+    def summarize(query, summaries, article_count):
+        prompts.append(summaries)
+        return BULLETS
+
+    for name in ("summary_cache", "recent_summaries", "query_results"):
+        monkeypatch.setattr(lc, name, SummaryCache(max_entries=64, ttl=600))
+    monkeypatch.setattr(lc, "query_index", QueryIndex())
+    monkeypatch.setattr(lc, "llm_breaker", CircuitBreaker(failure_threshold=1, recovery_timeout=600))
+    monkeypatch.setattr(lc, "_summarize", summarize)
+    monkeypatch.setattr(lc, "fuzzy_query_match", True)
+    monkeypatch.setitem(lc._clients, "newsapi", news)
+    return news, prompts
+
+
+def test_auto_mode_reuses_a_similar_query(pipeline):
+    news, prompts = pipeline
+    lc.get_summary_with_status("India-Pakistan tensions", mode="auto")
+    result = lc.get_summary_with_status("india pakistan tension latest", mode="auto")
+    assert news.calls == 1
+    assert len(prompts) == 1
+    assert result["matched_query"] == "India-Pakistan tensions"
+
+
+def test_auto_mode_keeps_the_prompt_budget_after_enrichment(pipeline, monkeypatch):
+    _, prompts = pipeline
+    long_text = " ".join(f"Sentence {i} about the border dispute talks." for i in range(400))
+    monkeypatch.setattr(lc, "enrich_full_text", True)
+    monkeypatch.setattr(lc, "enrich_articles",
+                        lambda articles, **kwargs: [a.with_changes(full_text=long_text) for a in articles])
+    lc.get_summary_with_status("border talks", mode="auto", fuzzy=False)
+    assert len(prompts) == 1
+    assert lc.count_tokens(prompts[0]) <= lc.context_token_budget
+
+
+class FakeStreamingLlm:
+    def stream(self, prompt):
+        for line in BULLETS.splitlines(keepends=True):
+            yield line
+
+
+def test_streamed_summary_is_served_stale_when_the_circuit_opens(pipeline, monkeypatch):
+    news, _ = pipeline
+    monkeypatch.setattr(lc, "get_llm", FakeStreamingLlm)
+    chunks, _ = lc.stream_summary("border talks", fuzzy=False)
+    assert "".join(chunks) == BULLETS
+    lc.llm_breaker.record_failure()
+    news.count += 1  # a new article changes the summary cache key
+    result = lc.get_summary_with_status("border talks", mode="single", fuzzy=False)
+    assert result["stale"]
+    assert result["summary"] == BULLETS
+
+
+def test_held_result_outlives_the_query_match_ttl(pipeline, monkeypatch):
+    news, _ = pipeline
+    monkeypatch.setattr(lc, "query_results", SummaryCache(max_entries=64, ttl=0.05))
+    lc.get_summary("India-Pakistan tensions", mode="single", fuzzy=False)
+    lc.hold_result("India-Pakistan tensions", ttl=60, mode="single")
+    lc.get_summary("Pakistan tensions", mode="single", fuzzy=False)  # an unrelated entry keeps the default
+    time.sleep(0.1)
+    assert lc.get_summary_with_status("india pakistan tension", mode="single")["matched_query"]
+    assert lc.query_results.ttl == 0.05
+    assert lc._similar_result("pakistan tension", "single") is None
+
+
+def test_batch_work_leaves_the_interactive_pool_free(pipeline, monkeypatch):
+    slow = threading.Event()
+
+    def summarize(query, summaries, article_count):
+        if "batch" in query:
+            slow.wait(0.2)
+        return BULLETS
+
+    monkeypatch.setattr(lc, "_summarize", summarize)
+    monkeypatch.setattr(lc, "summary_flight", SingleFlight(max_workers=1))
+    monkeypatch.setattr(lc, "batch_summary_pool", ThreadPoolExecutor(max_workers=1))
+    batch = threading.Thread(target=lambda: results.extend(
+        lc.get_summaries([f"batch topic {i}" for i in range(3)], concurrency=3, timeout=0.5, mode="single")
+    ))
+    results = []
+    batch.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    lc.get_summary("interactive topic", timeout=1, mode="single", fuzzy=False)
+    assert time.monotonic() - start < 0.15
+    batch.join()
+    # Three 0.2s summaries queued on one thread: the timeout counts only each one's own run
+    assert [r["error"] for r in results] == [None, None, None]
@@ -0,0 +1,71 @@
+import pytest
+
+topic_watch = pytest.importorskip("topic_watch")
+from article import Article, parse_published
+
+
+class FakeNews:
+    """Newest-first NewsAPI stand-in honouring ``from_param``/``to`` and ``max_articles``."""
+
+    def __init__(self):
+        self.articles = []
+        self.calls = []
+
+    def add(self, count):
+        start = len(self.articles)
+        for i in range(start, start + count):
+            self.articles.append(Article(
+                title=f"story {i}", url=f"https://example.com/{i}",
+                published_at=parse_published(f"2025-09-25T{10 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z"),
+            ))
+
+    def __call__(self, query, max_articles=None, from_param=None, to=None):
+        self.calls.append({"from_param": from_param, "to": to})
+        hits = [a for a in self.articles
+                if (from_param is None or a.published_iso[:19] >= from_param)
+                and (to is None or a.published_iso[:19] <= to)]
+        return sorted(hits, key=lambda a: a.published_at, reverse=True)[:max_articles]
+
+
+@pytest.fixture
+def news(monkeypatch):
+    fake = FakeNews()
+    monkeypatch.setattr(topic_watch, "get_news_articles", fake)
+    monkeypatch.setattr(topic_watch, "summarize_delta",
+                        lambda query, articles, previous_summary=None: (f"{len(articles)} articles", None))
+    return fake
+
+
+def _ids(articles):
+    return sorted(int(a.url.rsplit("/", 1)[1]) for a in articles)
+
+
+def test_first_run_takes_one_batch_and_sets_the_mark(news):
+    news.add(500)
+    watcher = topic_watch.TopicWatcher(max_articles=10)
+    result = watcher.run_once("topic")
+    assert len(news.calls) == 1
+    assert _ids(result["new_articles"]) == list(range(490, 500))
+    assert watcher.state("topic")["high_water"] == news.articles[-1].published_iso
+
+
+def test_later_runs_page_back_to_the_mark(news):
+    news.add(3)
+    watcher = topic_watch.TopicWatcher(max_articles=5)
+    watcher.run_once("topic")
+    news.add(17)
+    result = watcher.run_once("topic")
+    assert _ids(result["new_articles"]) == list(range(3, 20))
+    assert all(call["from_param"] for call in news.calls[1:])
+    assert not watcher.run_once("topic")["new_articles"]
+
+
+def test_paging_stops_at_max_pages(news):
+    news.add(1)
+    watcher = topic_watch.TopicWatcher(max_articles=5, max_pages=2)
+    watcher.run_once("topic")
+    news.add(50)
+    news.calls.clear()
+    result = watcher.run_once("topic")
+    assert len(news.calls) == 2
+    assert len(result["new_articles"]) == 9  # the second page overlaps the first by one
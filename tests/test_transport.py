@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from transport import CircuitBreaker, CircuitOpenError
+
+
+def _open_breaker(recovery_timeout=0.05):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=recovery_timeout)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_trial_success_closes_circuit():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_trial_failure_reopens_circuit():
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    with pytest.raises(ValueError):
+        breaker.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "unreachable")
+
+
+def test_abandoned_trial_does_not_wedge_breaker():
+    # A trial that never reports back (e.g. an abandoned stream) must not block recovery forever
+    breaker = _open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
@@ -0,0 +1,121 @@
+"""Incremental topic watching.
+
+Each run fetches only articles published since the topic's high-water mark
+(NewsAPI ``from``, paging back with ``to`` while batches come back full, up to
+``max_pages``), drops URLs already seen, and asks the LLM to fold just that
+delta into the previous bullets. The first run takes only the newest batch. A run with nothing new makes no LLM call.
+
+Usage: python topic_watch.py "India-Pakistan tensions" --every 300 [--db watch.db]
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import langchain_config
+from langchain_config import get_news_articles, summarize_delta
+from summary_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class TopicWatcher:
+    """Keeps per-topic state (high-water ``publishedAt``, seen URLs, last summary) in SQLite."""
+
+    def __init__(self, db_path=":memory:", max_seen=2000, max_articles=None, max_pages=5):
+        self.max_seen = max_seen
+        self.max_articles = max_articles
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watch_state (topic TEXT PRIMARY KEY, high_water TEXT, "
+            "seen_urls TEXT NOT NULL, summary TEXT, updated REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def state(self, query):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT high_water, seen_urls, summary, updated FROM watch_state WHERE topic = ?",
+                (normalize_query(query),)
+            ).fetchone()
+        if row is None:
+            return {"high_water": None, "seen_urls": [], "summary": None, "updated": None}
+        return {"high_water": row[0], "seen_urls": json.loads(row[1]), "summary": row[2], "updated": row[3]}
+
+    def _save(self, query, state):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watch_state (topic, high_water, seen_urls, summary, updated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(query), state["high_water"], json.dumps(state["seen_urls"][-self.max_seen:]),
+                 state["summary"], time.time())
+            )
+            self._db.commit()
+
+    def _fetch_new(self, query, state):
+        # Results come newest first and capped, so a full batch may stop short of the
+        # high-water mark: page back with ``to`` until the mark (or a seen URL) is reached.
+        # A first run has no mark and takes just the newest batch.
+        cap = self.max_articles or langchain_config.news_max_articles
+        params = {"max_articles": cap}
+        if state["high_water"]:
+            # newsapi-python wants YYYY-MM-DDTHH:MM:SS (UTC) without the trailing "Z"
+            params["from_param"] = state["high_water"][:19]
+        seen = set(state["seen_urls"])
+        new_articles = []
+        for _ in range(self.max_pages if state["high_water"] else 1):
+            batch = get_news_articles(query, **params)
+            fresh = [a for a in batch if a.url not in seen]
+            seen.update(a.url for a in fresh if a.url)
+            new_articles.extend(fresh)
+            oldest = min((a.published_iso for a in batch if a.published_iso), default="")[:19]
+            if len(batch) < cap or not fresh or not oldest or oldest == params.get("to"):
+                return new_articles
+            params["to"] = oldest
+        if state["high_water"]:
+            logger.warning("topic %r: stopped paging after %d pages; older new articles are skipped",
+                           query, self.max_pages)
+        return new_articles
+
+    def run_once(self, query):
+        """Returns ``{"summary", "new_articles", "changed"}`` for one incremental pass."""
+        state = self.state(query)
+        new_articles = self._fetch_new(query, state)
+        if not new_articles:
+            return {"summary": state["summary"], "new_articles": [], "changed": False}
+
+        summary, _ = summarize_delta(query, new_articles, previous_summary=state["summary"])
+        state["seen_urls"].extend(a.url for a in new_articles if a.url)
+        state["high_water"] = max([a.published_iso for a in new_articles] + [state["high_water"] or ""]) or None
+        changed = summary != state["summary"]
+        state["summary"] = summary
+        self._save(query, state)
+        return {"summary": summary, "new_articles": new_articles, "changed": changed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a running summary of a news topic up to date.")
+    parser.add_argument("query")
+    parser.add_argument("--every", type=float, default=300, help="seconds between runs (0 = run once)")
+    parser.add_argument("--db", default="topic_watch.db")
+    args = parser.parse_args(argv)
+
+    watcher = TopicWatcher(args.db)
+    while True:
+        result = watcher.run_once(args.query)
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if result["changed"]:
+            print(f"[{stamp}] {len(result['new_articles'])} new articles\n{result['summary']}\n", flush=True)
+        else:
+            print(f"[{stamp}] no new articles", flush=True)
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
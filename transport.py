@@ -0,0 +1,136 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# NewsAPI error codes worth another attempt; everything else (bad key, bad query) is final
+RETRYABLE_NEWSAPI_CODES = frozenset({"rateLimited", "unexpectedError"})
+
+
+def build_http_session(pool_size=20, connect_timeout=3.05, read_timeout=10.0):
+    """Keep-alive ``requests`` session whose timeouts override whatever callers pass."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class _TimeoutSession(requests.Session):
+        def request(self, *args, **kwargs):
+            # NewsApiClient hard-codes timeout=30; ours wins
+            kwargs["timeout"] = (connect_timeout, read_timeout)
+            return super().request(*args, **kwargs)
+
+    session = _TimeoutSession()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_httpx_client(pool_size=20, connect_timeout=3.05, read_timeout=60.0):
+    import httpx
+
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+    )
+
+
+def is_retryable(exc):
+    import requests
+
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    get_code = getattr(exc, "get_code", None)
+    return callable(get_code) and get_code() in RETRYABLE_NEWSAPI_CODES
+
+
+def retry_call(fn, *args, retries=3, base_delay=0.25, max_delay=4.0, retry_if=is_retryable, **kwargs):
+    """Calls ``fn`` with up to ``retries`` extra attempts using full-jitter exponential backoff."""
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            if attempt == retries or not retry_if(exc):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** attempt))))
+
+
+def hedged_call(executor, delay, fn, *args, **kwargs):
+    """Runs ``fn``; if it hasn't finished after ``delay`` seconds, races a second attempt.
+
+    Returns the first successful result. The loser is left to finish in the
+    background. An error is raised only when every attempt has failed.
+    """
+    pending = {executor.submit(fn, *args, **kwargs)}
+    done, pending = wait(pending, timeout=delay)
+    if not done:
+        pending.add(executor.submit(fn, *args, **kwargs))
+    error = None
+    while True:
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        if not pending:
+            raise error
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures.
+
+    While open, calls are refused until ``recovery_timeout`` has passed; then up
+    to ``half_open_max`` trial calls probe the dependency. A trial success closes
+    the circuit, a trial failure re-opens it. Trials that report nothing for
+    another ``recovery_timeout`` are treated as lost and new trials are allowed.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, half_open_max=1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max = half_open_max
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "open" and now - self._opened_at >= self.recovery_timeout:
+                self.state, self._trials = "half_open", 0
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and self._trials and now - self._trial_started >= self.recovery_timeout:
+                self._trials = 0  # the trial never reported back; don't stay wedged
+            if self.state == "half_open" and self._trials < self.half_open_max:
+                self._trials += 1
+                self._trial_started = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state, self._failures, self._trials = "closed", 0, 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state, self._opened_at = "open", time.monotonic()
+
+    def call(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise CircuitOpenError("Circuit open; skipping call")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result